@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from vision_app.models.metrics import coverage_and_angles, coverage_and_angles_batch, intersection_areas
+
+SQUARE = np.float32([[0, 0], [10, 0], [10, 10], [0, 10]])
+
+
+@pytest.mark.parametrize("marker, expected", [
+    (SQUARE, 100.0),
+    (SQUARE + [5, 0], 50.0),
+    (SQUARE * 0.5 + [2, 2], 25.0),
+    (SQUARE + [20, 0], 0.0),
+])
+def test_overlap(marker, expected):
+    overlap, angle_x, angle_y = coverage_and_angles(SQUARE, marker)
+    assert overlap == pytest.approx(expected)
+    # Translations and uniform scales do not tilt the axes.
+    assert angle_x == pytest.approx(0.0, abs=1e-6)
+    assert angle_y == pytest.approx(90.0, abs=1e-6)
+
+
+def test_known_pair():
+    ref = np.float32([[100, 100], [500, 100], [500, 400], [100, 400]])
+    marker = np.float32([[150, 120], [480, 140], [470, 390], [140, 380]])
+    overlap, angle_x, angle_y = coverage_and_angles(ref, marker)
+    assert overlap == pytest.approx(70.25)
+    assert angle_x == pytest.approx(-4.0379, abs=1e-3)
+    assert angle_y == pytest.approx(87.8160, abs=1e-3)
+
+
+def test_given_homography_is_used():
+    H = np.float64([[1, 0, 0], [0.1, 1, 0], [0, 0, 1]])
+    _, angle_x, angle_y = coverage_and_angles(SQUARE, SQUARE, H)
+    assert angle_x == pytest.approx(np.degrees(np.arctan2(0.1, 1)))
+    assert angle_y == pytest.approx(90.0)
+
+
+def test_degenerate_quads():
+    assert coverage_and_angles(SQUARE, np.zeros((4, 2), np.float32)) == (None, None, None)
+
+
+def test_single_pair_matches_batch():
+    rng = np.random.default_rng(0)
+    refs = SQUARE * 40 + rng.normal(0, 60, (500, 4, 2))
+    markers = SQUARE * 40 + rng.normal(0, 120, (500, 4, 2))
+    batch = coverage_and_angles_batch(refs, markers)
+    for i in range(len(refs)):
+        single = coverage_and_angles(refs[i], markers[i])
+        for value, values in zip(single, batch):
+            if np.isfinite(values[i]):
+                assert value == pytest.approx(values[i], rel=1e-4, abs=1e-4)
+            else:
+                assert value is None
+
+
+def test_concave_clipper():
+    dart = np.float64([[0, 0], [10, 0], [3, 3], [0, 10]])
+    big = SQUARE * 2.0
+    assert intersection_areas(big[None], dart[None])[0] == pytest.approx(30.0)
+    assert intersection_areas(dart[None], SQUARE[None])[0] == pytest.approx(30.0)
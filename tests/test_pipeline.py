@@ -0,0 +1,33 @@
+import cv2
+import numpy as np
+import pytest
+
+from vision_app.models.frame import CapturedFrame, FrameSet
+from vision_app.services.marker import MarkerTracker
+from vision_app.services.pipeline import AlignmentPipeline, FrameSetPipeline
+
+
+def _rect(x, y, w, h):
+    return np.float32([[x, y], [x + w, y], [x + w, y + h], [x, y + h]])
+
+
+def test_frame_set_measures_each_camera_against_its_own_reference():
+    rng = np.random.default_rng(0)
+    marker = cv2.GaussianBlur((rng.random((240, 320, 3)) * 255).astype(np.uint8), (3, 3), 0)
+    frames, refs = [], []
+    for x, y in ((150, 100), (50, 50)):
+        frame = np.zeros((480, 640, 3), np.uint8)
+        frame[y:y + 240, x:x + 320] = marker
+        frames.append(CapturedFrame(frame, 0.0, 1))
+        refs.append(_rect(x, y, 320, 240))
+
+    pipeline = FrameSetPipeline([AlignmentPipeline(MarkerTracker()) for _ in frames])
+    pipeline.load_marker(marker)
+    pipeline.set_references(refs)
+    first, second = pipeline.process(FrameSet(tuple(frames), 0.0, 0.0))
+
+    # The marker sits in a different place on each camera, but exactly on
+    # that camera's reference frame.
+    assert first.overlap == pytest.approx(100.0, abs=1.0)
+    assert second.overlap == pytest.approx(100.0, abs=1.0)
+    assert first.matches_vis is not None and second.matches_vis is None
@@ -3,9 +3,13 @@ from PIL import Image, ImageTk
 from screeninfo import get_monitors
 import ctypes
 import numpy as np
-import cv2
 import pyvirtualcam
 import argparse
+from vision_app.config import PROFILE_PATH
+from vision_app.models import CalibrationProfile
+from vision_app.services.prewarp import PreWarp
+from vision_app.services.transform import FrameTransform
+from vision_app.utils.watch import FileWatcher
 
 
 ctypes.windll.shcore.SetProcessDpiAwareness(1)
@@ -14,8 +18,12 @@ ctypes.windll.shcore.SetProcessDpiAwareness(1)
 parser = argparse.ArgumentParser(description="Display two images (TV and OBS) from given paths.")
 parser.add_argument("--tv", required=True, help="Path of the image to display on the TV screen")
 parser.add_argument("--obs", required=True, help="Path of the image to stream to the OBS virtual camera")
+parser.add_argument("--prewarp", action="store_true", help="Pre-warp the TV output with the calibration profile")
+parser.add_argument("--profile", default=str(PROFILE_PATH), help="Calibration profile saved by vision_app")
 args = parser.parse_args()
 
+prewarp = PreWarp.from_profile(CalibrationProfile.load(args.profile)) if args.prewarp else None
+
 image_tv_path = args.tv
 image_obs_path = args.obs
 
@@ -28,24 +36,6 @@ monitor_tv = monitors[2]
 monitor_obs = monitors[1]
 
 
-def resize_to_screen(img_pil, monitor):
-    screen_w, screen_h = monitor.width, monitor.height
-    video_ratio = img_pil.width / img_pil.height
-    screen_ratio = screen_w / screen_h
-
-    if abs(video_ratio - screen_ratio) > 0.01:
-        new_height = screen_h
-        new_width = int(new_height * video_ratio)
-        if new_width > screen_w:
-            new_width = screen_w
-            new_height = int(new_width / video_ratio)
-        img_pil = img_pil.resize((new_width, new_height), Image.LANCZOS)
-    else:
-        img_pil = img_pil.resize((screen_w, screen_h), Image.LANCZOS)
-
-    return img_pil
-
-
 def load_image_safe(path):
     try:
         return Image.open(path).convert("RGB")
@@ -73,22 +63,42 @@ while init_image is None:
     root.update()
     init_image = load_image_safe(image_obs_path)
 
-resized = resize_to_screen(init_image, monitor_obs)
-obs_np = np.array(resized)
-obs_bgr = cv2.cvtColor(obs_np, cv2.COLOR_RGB2BGR)
+# Output geometry is planned once per image size and applied in one pass into
+# a reused buffer. The OBS frame keeps the size fitted to the first image;
+# later images are letterboxed into it.
+tv_transform = FrameTransform((monitor_tv.width, monitor_tv.height))
+obs_size = FrameTransform((monitor_obs.width, monitor_obs.height)).content_size(init_image.size)
+obs_transform = FrameTransform(obs_size, mirror=True, pad=True)
+obs_frame = obs_transform.apply(np.asarray(init_image))
 
-cam = pyvirtualcam.Camera(width=obs_bgr.shape[1], height=obs_bgr.shape[0], fps=30, fmt=pyvirtualcam.PixelFormat.BGR)
-cam.send(obs_bgr)
+cam = pyvirtualcam.Camera(width=obs_size[0], height=obs_size[1], fps=30, fmt=pyvirtualcam.PixelFormat.RGB)
+cam.send(obs_frame)
 cam.sleep_until_next_frame()
 print(f"OBS virtual camera active: {cam.device}")
 
 
+tv_watcher = FileWatcher(image_tv_path)
+obs_watcher = FileWatcher(image_obs_path)
+
+
 def update():
-    img_tv = load_image_safe(image_tv_path)
-    img_obs = load_image_safe(image_obs_path)
+    global obs_frame
+    # Images are only decoded and rescaled when their file changes; a file
+    # that cannot be decoded (e.g. still locked) keeps the last frame until
+    # a later poll reads it.
+    img_tv = load_image_safe(image_tv_path) if tv_watcher.poll() else None
+    img_obs = load_image_safe(image_obs_path) if obs_watcher.poll() else None
+    # Only a successful load marks a version as seen; failed ones are retried.
+    if img_tv:
+        tv_watcher.ack()
+    if img_obs:
+        obs_watcher.ack()
 
     if img_tv:
-        resized_tv = resize_to_screen(img_tv, monitor_tv)
+        if prewarp is not None:
+            resized_tv = Image.fromarray(prewarp.apply(np.asarray(img_tv), (monitor_tv.width, monitor_tv.height)))
+        else:
+            resized_tv = Image.fromarray(tv_transform.apply(np.asarray(img_tv)))
         img_tk = ImageTk.PhotoImage(resized_tv, master=tv_window)
 
         if not hasattr(tv_window, "img_id"):
@@ -99,12 +109,11 @@ def update():
         tv_window.image_tk = img_tk
 
     if img_obs:
-        mirrored = img_obs.transpose(Image.FLIP_LEFT_RIGHT)
-        resized_obs = resize_to_screen(mirrored, monitor_obs)
-        obs_np = np.array(resized_obs)
-        obs_bgr = cv2.cvtColor(obs_np, cv2.COLOR_RGB2BGR)
-        cam.send(obs_bgr)
-        cam.sleep_until_next_frame()
+        obs_frame = obs_transform.apply(np.asarray(img_obs))
+
+    # The virtual camera needs a steady stream: repeat the last frame.
+    cam.send(obs_frame)
+    cam.sleep_until_next_frame()
 
     tv_window.after(33, update)  
 
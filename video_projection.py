@@ -1,22 +1,30 @@
-kimport cv2
+import cv2
 import numpy as np
 import pyvirtualcam
 import ctypes
 from screeninfo import get_monitors
+import argparse
+import time
+from vision_app.config import PROFILE_PATH
+from vision_app.models import CalibrationProfile
+from vision_app.services.prewarp import PreWarp
+from vision_app.services.playback import VideoDecoder, OutputStage, FramePacer
+from vision_app.services.transform import FrameTransform
 
 
 ctypes.windll.shcore.SetProcessDpiAwareness(1)
 
 
-video_path = "video2.mp4"
-cap = cv2.VideoCapture(video_path)
-if not cap.isOpened():
-    print("Unable to read the video.")
-    exit()
-
+parser = argparse.ArgumentParser(description="Play a video on the TV and the OBS virtual camera.")
+parser.add_argument("video", nargs="?", default="video2.mp4", help="Video file")
+parser.add_argument("--prewarp", action="store_true", help="Pre-warp the TV output with the calibration profile")
+parser.add_argument("--profile", default=str(PROFILE_PATH), help="Calibration profile saved by vision_app")
+parser.add_argument("--prefetch", type=int, default=8, help="Frames decoded ahead")
+args = parser.parse_args()
 
-fps = cap.get(cv2.CAP_PROP_FPS)
+prewarp = PreWarp.from_profile(CalibrationProfile.load(args.profile)) if args.prewarp else None
 
+REPORT_EVERY_S = 5.0
 
 monitors = get_monitors()
 if len(monitors) < 3:
@@ -28,29 +36,10 @@ monitor_tv = monitors[2]
 #Monitor 2 (OBS)
 monitor_obs = monitors[1]
 
-def resize_to_screen(img, monitor):
-    screen_w, screen_h = monitor.width, monitor.height
-    video_ratio = img.shape[1] / img.shape[0]
-    screen_ratio = screen_w / screen_h
-
-    if abs(video_ratio - screen_ratio) > 0.01:
-        new_height = screen_h
-        new_width = int(new_height * video_ratio)
-
-        if new_width > screen_w:
-            new_width = screen_w
-            new_height = int(new_width / video_ratio)
-
-        img = cv2.resize(img, (new_width, new_height))
-    else:
-        img = cv2.resize(img, (screen_w, screen_h))
-
-    return img
-
-
-ret, frame = cap.read()
-if not ret:
-    print("Unable to read the first frame.")
+try:
+    decoder = VideoDecoder(args.video, prefetch=args.prefetch).start()
+except IOError as e:
+    print(e)
     exit()
 
 #Set up OBS virtual camera
@@ -58,35 +47,64 @@ obs_width =1920
 obs_height =1080
 cam =pyvirtualcam.Camera(width=obs_width, height=obs_height, fps=30, fmt=pyvirtualcam.PixelFormat.BGR)
 
-#Set up OpenCV window for the third monitor (TV)
-cv2.namedWindow("TV Display", cv2.WND_PROP_FULLSCREEN)
-cv2.setWindowProperty("TV Display", cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
-cv2.moveWindow("TV Display", monitor_tv.x, monitor_tv.y)
+
+# Output geometry is planned once per video size; each frame is one pass
+# into a reused buffer.
+tv_transform = FrameTransform((monitor_tv.width, monitor_tv.height))
+tv_buffer = None
+#Mirrored video, letterboxed to 1920x1080
+obs_transform = FrameTransform((obs_width, obs_height), mirror=True, pad=True)
 
 
-while True:
-    ret, frame =cap.read()
-    if not ret:
-        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)  # Restart the video if it's over
-        continue
+def send_obs(frame):
+    cam.send(obs_transform.apply(frame))
 
-    #Direct TV with OpenCV
-    frame_resized_tv = resize_to_screen(frame, monitor_tv)
-    cv2.imshow("TV Display", frame_resized_tv) 
 
-    #mirror video
-    mirror = cv2.flip(frame, 1)
-    frame_resized_obs = resize_to_screen(mirror, monitor_obs)
+obs_stage = OutputStage("obs", send_obs).start()
+pacer = FramePacer(decoder.fps)
 
-    #Ensure that the OBS frame is resized to 1920x1080
-    frame_resized_obs = cv2.resize(frame_resized_obs, (obs_width, obs_height))
-    cam.send(frame_resized_obs)
-    key = cv2.waitKey(int(1000 / fps)) 
+#Set up OpenCV window for the third monitor (TV)
+cv2.namedWindow("TV Display", cv2.WND_PROP_FULLSCREEN)
+cv2.setWindowProperty("TV Display", cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
+cv2.moveWindow("TV Display", monitor_tv.x, monitor_tv.y)
 
-    # Exit if user presses 'q'
-    if key == ord('q'):
-        break
 
-cap.release()
-cam.close()
-cv2.destroyAllWindows()
+def report():
+    print(f"decoded {decoder.decoded}  shown {pacer.shown}  late {pacer.late}  dropped {pacer.dropped}  "
+          f"obs sent {obs_stage.sent}  obs dropped {obs_stage.dropped}")
+
+
+# The decode thread prefetches and loops the video; this thread paces the
+# frames on the monotonic clock and shows them on the TV (HighGUI windows
+# belong to the thread that created them), the OBS output runs on its own.
+next_report = time.monotonic() + REPORT_EVERY_S
+try:
+    while True:
+        packet = decoder.get(timeout=0.1)
+        if packet is None:
+            if not decoder.running:
+                break
+        elif pacer.wait(packet.pts):
+            #Direct TV with OpenCV
+            if prewarp is not None:
+                frame_resized_tv = tv_buffer = prewarp.apply(packet.image, (monitor_tv.width, monitor_tv.height), tv_buffer)
+            else:
+                frame_resized_tv = tv_transform.apply(packet.image)
+            cv2.imshow("TV Display", frame_resized_tv)
+            obs_stage.offer(packet.image)
+
+        # Runs on every iteration, dropped frames included, so the window keeps repainting and 'q' works.
+        key = cv2.waitKey(1)
+        # Exit if user presses 'q'
+        if key == ord('q'):
+            break
+
+        if time.monotonic() >= next_report:
+            report()
+            next_report += REPORT_EVERY_S
+finally:
+    decoder.stop()
+    obs_stage.stop()
+    report()
+    cam.close()
+    cv2.destroyAllWindows()
@@ -1,9 +1,17 @@
-
 from __future__ import annotations
+import argparse
+from pathlib import Path
+from .config import PROFILE_PATH, CAM_INDEX
 from .ui.main_window import MainWindow
 
-def main():
-    app = MainWindow()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Projector calibration.")
+    parser.add_argument("--profile", type=Path, default=PROFILE_PATH, help="Calibration profile to save / resume")
+    parser.add_argument("--resume", action="store_true", help="Start on the alignment screen from the profile")
+    parser.add_argument("--camera", type=int, nargs="+", default=[CAM_INDEX],
+                        help="Camera index; several indices align every camera against its own frame")
+    args = parser.parse_args(argv)
+    app = MainWindow(profile_path=args.profile, resume=args.resume, camera=args.camera)
     app.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,257 @@
+
+"""
+Headless calibration over recorded material.
+
+    python -m vision_app.batch recordings/ session.mp4 --out results.jsonl
+    python -m vision_app.batch session.mp4 --marker left.jpg right.jpg
+
+Every frame of the given image folders / video files goes through the HSV
+border detection and the marker homography + coverage metrics, spread over a
+process pool. One record per frame and marker is written as JSONL or CSV.
+Several markers share one feature extraction per frame.
+"""
+from __future__ import annotations
+import argparse
+import csv
+import json
+import os
+import sys
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+import cv2
+import numpy as np
+
+from .config import HSV_DEFAULTS, MARKER_IMAGE, FEATURE_BACKEND
+from .models import HsvThresholds
+from .services.preprocessing import HsvPreprocessor, inner_quads
+from .services.marker import MarkerTracker, MultiMarkerTracker
+from .services.pipeline import AlignmentPipeline, MultiAlignmentPipeline
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff"}
+FIELDS = [
+    "source", "frame", "marker", "border_found", "ref_quad", "marker_found", "num_inliers",
+    "dst_quad", "overlap", "angle_x", "angle_y",
+]
+
+# (kind, path, payload): ("images", None, [paths]) or ("video", path, (start, stop))
+Task = Tuple[str, Optional[str], object]
+
+_worker = None
+
+
+class _Worker:
+    def __init__(self, marker_paths: List[str], thresholds: HsvThresholds, backend: str, step: int) -> None:
+        cv2.setNumThreads(1)
+        self.thresholds = thresholds
+        self.step = step
+        self.preprocessor = HsvPreprocessor()
+        markers = []
+        for path in marker_paths:
+            marker = cv2.imread(path)
+            if marker is None:
+                raise FileNotFoundError(path)
+            markers.append(marker)
+        self.names = [Path(p).stem for p in marker_paths]
+        # Frames are judged independently: no temporal smoothing or tracking.
+        options = dict(tracking=False, quad_filter=None)
+        if len(markers) == 1:
+            tracker = MarkerTracker(backend=backend, **options)
+            tracker.load_marker(markers[0])
+            self.trackers = [tracker]
+            self.pipeline = AlignmentPipeline(tracker)
+            self.multi = None
+        else:
+            self.multi = MultiMarkerTracker(backend, **options)
+            for name, marker in zip(self.names, markers):
+                self.multi.add_marker(name, marker)
+            self.trackers = self.multi.trackers
+            self.pipeline = MultiAlignmentPipeline(self.multi)
+
+    def process(self, source: str, index, frame: np.ndarray) -> List[dict]:
+        border = self.preprocessor.process(frame, self.thresholds, annotate=False)
+        ref_quad = None if border.quad is None else np.float32(border.quad.reshape(4, 2))
+        # Nothing from the previous frame (maybe another file) may steer the search.
+        for tracker in self.trackers:
+            tracker.reset()
+        if self.multi is None:
+            self.pipeline.ref_quad = ref_quad
+            refs = [ref_quad]
+            aligned_all = [self.pipeline.process(frame, visualize=False)]
+        else:
+            # Markers may sit on different displays: find them first, then measure
+            # each against the border it lies in.
+            borders = [np.float32(q.reshape(4, 2)) for q in inner_quads(border.mask, len(self.names))]
+            for name in self.names:
+                self.multi.set_reference(name, None)
+            results = self.multi.match(frame)
+            refs = [_display_of(r.dst_quad, borders) for r in results]
+            for name, ref in zip(self.names, refs):
+                self.multi.set_reference(name, ref)
+            aligned_all = self.pipeline.measure(frame, results, visualize=False)
+
+        records = []
+        for name, ref_quad, aligned in zip(self.names, refs, aligned_all):
+            result = aligned.homography
+            records.append({
+                "source": source,
+                "frame": index,
+                "marker": name,
+                "border_found": ref_quad is not None,
+                "ref_quad": None if ref_quad is None else ref_quad.round(2).tolist(),
+                "marker_found": result.dst_quad is not None,
+                "num_inliers": result.num_inliers,
+                "dst_quad": None if result.dst_quad is None else result.dst_quad.reshape(4, 2).round(2).tolist(),
+                "overlap": aligned.overlap,
+                "angle_x": aligned.angle_x,
+                "angle_y": aligned.angle_y,
+            })
+        return records
+
+    def run(self, task: Task) -> List[dict]:
+        kind, path, payload = task
+        records = []
+        if kind == "images":
+            for image_path in payload:
+                frame = cv2.imread(image_path)
+                if frame is not None:
+                    records.extend(self.process(image_path, Path(image_path).name, frame))
+            return records
+
+        start, stop = payload
+        cap = cv2.VideoCapture(path)
+        try:
+            if start:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+            index = start
+            while stop is None or index < stop:
+                if index % self.step:
+                    if not cap.grab():
+                        break
+                else:
+                    ok, frame = cap.read()
+                    if not ok:
+                        break
+                    records.extend(self.process(path, index, frame))
+                index += 1
+        finally:
+            cap.release()
+        return records
+
+
+def _display_of(dst_quad: np.ndarray | None, borders: List[np.ndarray]) -> np.ndarray | None:
+    """The border containing the marker centre, else the one whose centre is nearest."""
+    if dst_quad is None or not borders:
+        return None
+    centre = dst_quad.reshape(4, 2).mean(axis=0)
+    for quad in borders:
+        if cv2.pointPolygonTest(quad, (float(centre[0]), float(centre[1])), False) >= 0:
+            return quad
+    return min(borders, key=lambda quad: float(np.linalg.norm(quad.mean(axis=0) - centre)))
+
+
+def _init_worker(marker_paths: List[str], thresholds: HsvThresholds, backend: str, step: int) -> None:
+    global _worker
+    _worker = _Worker(marker_paths, thresholds, backend, step)
+
+
+def _run_task(task: Task) -> List[dict]:
+    return _worker.run(task)
+
+
+def build_tasks(inputs: Iterable[str], chunk: int) -> List[Task]:
+    """Split image folders into groups of ``chunk`` files and videos into ``chunk``-frame ranges."""
+    tasks: List[Task] = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            images = sorted(str(p) for p in path.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+            tasks.extend(("images", None, images[i:i + chunk]) for i in range(0, len(images), chunk))
+        elif path.suffix.lower() in IMAGE_EXTENSIONS:
+            tasks.append(("images", None, [str(path)]))
+        else:
+            cap = cv2.VideoCapture(str(path))
+            if not cap.isOpened():
+                print(f"Unable to read {path}", file=sys.stderr)
+                continue
+            count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            cap.release()
+            if count <= 0:
+                tasks.append(("video", str(path), (0, None)))
+            else:
+                tasks.extend(("video", str(path), (i, min(i + chunk, count))) for i in range(0, count, chunk))
+    return tasks
+
+
+class _Writer:
+    def __init__(self, out, fmt: str) -> None:
+        self.out = out
+        self.fmt = fmt
+        if fmt == "csv":
+            self._csv = csv.DictWriter(out, fieldnames=FIELDS)
+            self._csv.writeheader()
+
+    def write(self, record: dict) -> None:
+        if self.fmt == "csv":
+            row = dict(record)
+            for key in ("ref_quad", "dst_quad"):
+                row[key] = "" if row[key] is None else json.dumps(row[key])
+            self._csv.writerow(row)
+        else:
+            self.out.write(json.dumps(record) + "\n")
+
+
+def run(inputs: Iterable[str], out, fmt: str = "jsonl", thresholds: HsvThresholds | None = None,
+        markers: Iterable[Path] = (MARKER_IMAGE,), backend: str = FEATURE_BACKEND, workers: int | None = None,
+        chunk: int = 64, step: int = 1) -> int:
+    """Process ``inputs`` and write one record per frame and marker to ``out``. Returns the number of records."""
+    thresholds = thresholds or HsvThresholds.from_defaults(HSV_DEFAULTS)
+    tasks = build_tasks(inputs, chunk)
+    writer = _Writer(out, fmt)
+    count = 0
+    init_args = ([str(m) for m in markers], thresholds, backend, step)
+    with Pool(processes=workers or os.cpu_count(), initializer=_init_worker, initargs=init_args) as pool:
+        for records in pool.imap(_run_task, tasks):
+            for record in records:
+                writer.write(record)
+            count += len(records)
+    return count
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Headless border/marker calibration over images and videos.")
+    parser.add_argument("inputs", nargs="+", help="Image folders, image files or video files")
+    parser.add_argument("--out", default="-", help="Output file (default: stdout)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default=None,
+                        help="Output format (default: from --out extension, else jsonl)")
+    parser.add_argument("--hsv", type=int, nargs=6, metavar=("H0", "H1", "S0", "S1", "V0", "V1"),
+                        help="HSV thresholds of the TV border")
+    parser.add_argument("--marker", type=Path, nargs="+", default=[MARKER_IMAGE],
+                        help="Marker image(s); several are matched through one shared index")
+    parser.add_argument("--backend", default=FEATURE_BACKEND, help="Feature backend")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunk", type=int, default=64, help="Frames per task")
+    parser.add_argument("--step", type=int, default=1, help="Process every Nth video frame")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    fmt = args.format or ("csv" if args.out.lower().endswith(".csv") else "jsonl")
+    thresholds = None
+    if args.hsv:
+        h0, h1, s0, s1, v0, v1 = args.hsv
+        thresholds = HsvThresholds((h0, h1), (s0, s1), (v0, v1))
+
+    out = sys.stdout if args.out == "-" else open(args.out, "w", newline="", encoding="utf-8")
+    try:
+        count = run(args.inputs, out, fmt, thresholds, args.marker, args.backend,
+                    args.workers, max(1, args.chunk), max(1, args.step))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"{count} records written", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
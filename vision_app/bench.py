@@ -0,0 +1,280 @@
+
+"""
+Benchmarks of the vision hot paths on synthetic frames.
+
+    python -m vision_app.bench --sizes 720p 1080p --repeat 100 --out bench.json
+    python -m vision_app.bench --startup --repeat 10
+
+Frames are generated (blue TV border + warped marker), so no camera is needed.
+Cases that need Tk are skipped when no display is available. Results are
+latency percentiles (ms) and throughput per case and frame size, as JSON.
+``--startup`` instead times cold imports and the first window, each run in a
+fresh interpreter.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+import cv2
+import numpy as np
+
+from .config import HSV_DEFAULTS, MARKER_IMAGE, AUTOTUNE_FRAMES
+from .models import HsvThresholds
+from .models.metrics import coverage_and_angles
+from .services.preprocessing import compute_hsv_mask, biggest_inner_quad, HsvPreprocessor, ControleurImage
+from .services.autotune import auto_tune
+from .services.marker import MarkerTracker
+from .services.drawing import PanelRenderer, pil_from_bgr
+
+SIZES: Dict[str, Tuple[int, int]] = {
+    "480p": (640, 480),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+}
+BORDER_BGR = (200, 60, 20)
+
+
+def synthetic_marker(seed: int = 0) -> np.ndarray:
+    """The real marker when present, otherwise a reproducible textured pattern."""
+    marker = cv2.imread(str(MARKER_IMAGE)) if MARKER_IMAGE.exists() else None
+    if marker is not None:
+        return marker
+    rng = np.random.default_rng(seed)
+    blocks = rng.integers(0, 256, (24, 32, 3), dtype=np.uint8)
+    marker = cv2.resize(blocks, (1024, 768), interpolation=cv2.INTER_NEAREST)
+    return cv2.GaussianBlur(marker, (3, 3), 0)
+
+
+def synthetic_scene(size: Tuple[int, int], marker: np.ndarray, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    A ``size`` (w, h) frame with a blue border around a slightly rotated copy of
+    ``marker``. Returns the frame and the marker quad drawn in it.
+    """
+    w, h = size
+    rng = np.random.default_rng(seed)
+    frame = np.full((h, w, 3), 90, np.uint8)
+    frame += rng.integers(0, 30, (h, w, 3), dtype=np.uint8)
+    outer = np.int32([[0.15 * w, 0.12 * h], [0.85 * w, 0.12 * h], [0.85 * w, 0.88 * h], [0.15 * w, 0.88 * h]])
+    inner = np.int32([[0.2 * w, 0.2 * h], [0.8 * w, 0.2 * h], [0.8 * w, 0.8 * h], [0.2 * w, 0.8 * h]])
+    cv2.fillPoly(frame, [outer], BORDER_BGR)
+    cv2.fillPoly(frame, [inner], (40, 40, 40))
+
+    mh, mw = marker.shape[:2]
+    src = np.float32([[0, 0], [mw, 0], [mw, mh], [0, mh]])
+    dst = np.float32([[0.23 * w, 0.24 * h], [0.78 * w, 0.22 * h], [0.77 * w, 0.77 * h], [0.22 * w, 0.78 * h]])
+    H = cv2.getPerspectiveTransform(src, dst)
+    warped = cv2.warpPerspective(marker, H, (w, h))
+    coverage = cv2.warpPerspective(np.full((mh, mw), 255, np.uint8), H, (w, h))
+    np.copyto(frame, warped, where=coverage[..., None] > 0)
+    return frame, dst
+
+
+class _NoSlider:
+    def __init__(self, values: Tuple[int, int]) -> None:
+        self.values = values
+
+    def getValues(self):
+        return self.values
+
+
+def _tk_root():
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        return root
+    except Exception:
+        return None
+
+
+def build_cases(frame: np.ndarray, marker: np.ndarray, marker_quad: np.ndarray,
+                tk_root=None) -> Dict[str, Optional[Callable[[], object]]]:
+    """Benchmark callables for one frame; None marks a case that cannot run here."""
+    thresholds = HsvThresholds.from_defaults(HSV_DEFAULTS)
+    mask = compute_hsv_mask(frame, *HSV_DEFAULTS)
+    inner = biggest_inner_quad(mask)
+    ref_quad = np.float32(inner.reshape(4, 2)) if inner is not None else np.float32(marker_quad)
+    frame_pil = pil_from_bgr(frame)
+    h, w = frame.shape[:2]
+    panel = (max(10, w // 2), max(10, h // 2))
+
+    controleur = ControleurImage(*(_NoSlider(r) for r in HSV_DEFAULTS))
+    preprocessor = HsvPreprocessor()
+    renderer = PanelRenderer(None, size=panel)
+
+    detector = MarkerTracker(tracking=False, quad_filter=None)
+    detector.load_marker(marker)
+    detector.set_reference(ref_quad)
+    tracker = MarkerTracker(tracking=True, quad_filter=None)
+    tracker.load_marker(marker)
+    tracker.match(frame)
+
+    cases: Dict[str, Optional[Callable[[], object]]] = {
+        "compute_hsv_mask": lambda: compute_hsv_mask(frame, *HSV_DEFAULTS),
+        "biggest_inner_quad": lambda: biggest_inner_quad(mask),
+        "auto_tune": lambda: auto_tune([frame] * AUTOTUNE_FRAMES),
+        "traiter_image": lambda: controleur.traiter_image(frame_pil, thresholds),
+        "hsv_preprocessor": lambda: preprocessor.process(frame, thresholds),
+        "hsv_threshold_change": lambda: preprocessor.process(frame, thresholds, frame_key="bench"),
+        "match_detect": lambda: detector.match(frame),
+        "match_track": lambda: tracker.match(frame),
+        "coverage_and_angles": lambda: coverage_and_angles(ref_quad, marker_quad),
+        "panel_prepare": lambda: renderer.prepare(frame, panel),
+        "photoimage_fit": None,
+        "resize_image_fixed": None,
+    }
+    if tk_root is not None:
+        import tkinter as tk
+        from .services.drawing import photoimage_fit, GestionAffichage
+        label = tk.Label(tk_root)
+        cases["photoimage_fit"] = lambda: photoimage_fit(frame_pil, panel)
+        cases["resize_image_fixed"] = lambda: GestionAffichage.resize_image_fixed(frame_pil, label, *panel)
+    return cases
+
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int) -> Dict[str, float]:
+    for _ in range(warmup):
+        fn()
+    samples = np.empty(repeat, np.float64)
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples[i] = (time.perf_counter() - t0) * 1000.0
+    return summarize(samples)
+
+
+def summarize(samples: np.ndarray) -> Dict[str, float]:
+    repeat = len(samples)
+    p50, p90, p95, p99 = np.percentile(samples, [50, 90, 95, 99])
+    mean = float(samples.mean())
+    return {
+        "n": repeat,
+        "mean_ms": mean,
+        "min_ms": float(samples.min()),
+        "p50_ms": float(p50),
+        "p90_ms": float(p90),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "max_ms": float(samples.max()),
+        "throughput_fps": 1000.0 / mean if mean > 0 else float("inf"),
+    }
+
+
+# Snippets run in a fresh interpreter; each prints its own duration in seconds.
+STARTUP_CASES: Dict[str, str] = {
+    "import_config": "import vision_app.config",
+    "import_models": "import vision_app.models",
+    "import_services": "import vision_app.services",
+    "import_video": "import vision_app.services.video",
+    "import_main_window": "import vision_app.ui.main_window",
+    "tracker_init": "from vision_app.services.marker import MarkerTracker\nMarkerTracker()",
+    "first_window": (
+        "from vision_app.ui.main_window import MainWindow\n"
+        "w = MainWindow()\nw.root.update()\n"
+        "print(time.perf_counter() - t0)\nw._on_close()\nraise SystemExit"
+    ),
+}
+
+
+def startup_sample(snippet: str) -> float:
+    code = "import time\nt0 = time.perf_counter()\n" + snippet + "\nprint(time.perf_counter() - t0)\n"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return float(out.stdout.strip().splitlines()[-1]) * 1000.0
+
+
+def run_startup(cases: Optional[List[str]], repeat: int) -> dict:
+    has_display = True
+    root = _tk_root()
+    if root is None:
+        has_display = False
+    else:
+        root.destroy()
+    results = []
+    for name, snippet in STARTUP_CASES.items():
+        if cases and name not in cases:
+            continue
+        entry = {"case": name, "size": None}
+        if name == "first_window" and not has_display:
+            entry["skipped"] = "no display"
+        else:
+            try:
+                entry.update(summarize(np.array([startup_sample(snippet) for _ in range(repeat)])))
+            except (subprocess.CalledProcessError, ValueError) as e:
+                entry["skipped"] = f"failed: {e}"
+        results.append(entry)
+        print(f"startup {name:<22} " + (
+            entry["skipped"] if "skipped" in entry else f"p50 {entry['p50_ms']:8.2f} ms  p99 {entry['p99_ms']:8.2f} ms"
+        ), file=sys.stderr)
+    return {"environment": environment(), "results": results}
+
+
+def environment() -> dict:
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "opencv": cv2.__version__,
+        "opencv_threads": cv2.getNumThreads(),
+        "numpy": np.__version__,
+    }
+
+
+def run(sizes: List[str], cases: Optional[List[str]], repeat: int, warmup: int) -> dict:
+    marker = synthetic_marker()
+    root = _tk_root()
+    results = []
+    try:
+        for size_name in sizes:
+            frame, marker_quad = synthetic_scene(SIZES[size_name], marker)
+            for name, fn in build_cases(frame, marker, marker_quad, root).items():
+                if cases and name not in cases:
+                    continue
+                entry = {"case": name, "size": size_name, "width": frame.shape[1], "height": frame.shape[0]}
+                if fn is None:
+                    entry["skipped"] = "no display"
+                else:
+                    entry.update(measure(fn, repeat, warmup))
+                results.append(entry)
+                print(f"{size_name:>6} {name:<22} " + (
+                    "skipped" if fn is None else f"p50 {entry['p50_ms']:8.2f} ms  p99 {entry['p99_ms']:8.2f} ms"
+                ), file=sys.stderr)
+    finally:
+        if root is not None:
+            root.destroy()
+    return {"environment": environment(), "results": results}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the vision pipeline on synthetic frames.")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--cases", nargs="+", default=None, help="Only run these cases")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--out", default="-", help="JSON output file (default: stdout)")
+    parser.add_argument("--startup", action="store_true", help="Time cold imports and startup instead")
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        report = run_startup(args.cases, max(1, args.repeat))
+    else:
+        report = run(args.sizes, args.cases, max(1, args.repeat), max(0, args.warmup))
+    text = json.dumps(report, indent=2)
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Multi-camera check.
+
+    python -m vision_app.cameras 0 1 --seconds 10 --show
+
+Opens the cameras (default: ``CAM_SOURCES``) in a ``CapturePool``, reads
+timestamp-aligned frame sets for a while and reports, per camera, the capture
+rate, grab time, delivery latency and frames grabbed, plus how many sets were
+delivered or rejected for skew. ``--show`` displays each set side by side.
+"""
+from __future__ import annotations
+import argparse
+import sys
+import time
+import cv2
+import numpy as np
+
+from .config import CAM_SOURCES, SYNC_MAX_SKEW
+from .services.capture_pool import CapturePool
+
+REPORT_EVERY_S = 2.0
+PREVIEW_HEIGHT = 360
+
+
+def _source(value: str):
+    return int(value) if value.isdigit() else value
+
+
+def report(pool: CapturePool) -> None:
+    for source, s in pool.stats().items():
+        print(f"camera {source:<10} {s['fps']:6.1f} fps  grab {s['grab_ms']:6.2f} ms  "
+              f"latency {s['latency_ms']:6.2f} ms  grabbed {s['grabbed']}", file=sys.stderr)
+    print(f"sets delivered {pool.sets_delivered}  skewed {pool.sets_skewed}", file=sys.stderr)
+
+
+def preview(images) -> np.ndarray:
+    tiles = [cv2.resize(im, (max(1, im.shape[1] * PREVIEW_HEIGHT // im.shape[0]), PREVIEW_HEIGHT)) for im in images]
+    return np.hstack(tiles)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Capture rate and sync check of several cameras.")
+    parser.add_argument("sources", nargs="*", type=_source, default=CAM_SOURCES, help="Camera indices or URLs")
+    parser.add_argument("--seconds", type=float, default=10.0, help="How long to capture")
+    parser.add_argument("--max-skew", type=float, default=SYNC_MAX_SKEW, help="Largest skew of a set, in seconds")
+    parser.add_argument("--show", action="store_true", help="Display the synced sets")
+    args = parser.parse_args(argv)
+
+    pool = CapturePool(args.sources)
+    if not len(pool):
+        print("No camera could be opened.", file=sys.stderr)
+        return
+    deadline = time.monotonic() + args.seconds
+    next_report = time.monotonic() + REPORT_EVERY_S
+    try:
+        while time.monotonic() < deadline:
+            frame_set = pool.read_synced(args.max_skew)
+            if frame_set is not None and args.show:
+                cv2.imshow("Cameras", preview(frame_set.images))
+            if args.show:
+                if cv2.waitKey(1) == ord('q'):
+                    break
+            elif frame_set is None:
+                time.sleep(0.002)
+            if time.monotonic() >= next_report:
+                report(pool)
+                next_report += REPORT_EVERY_S
+    finally:
+        report(pool)
+        pool.release()
+        if args.show:
+            cv2.destroyAllWindows()
+
+
+if __name__ == "__main__":
+    main()
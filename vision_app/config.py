@@ -1,7 +1,7 @@
 
 from __future__ import annotations
+import os
 from pathlib import Path
-import cv2
 
 
 
@@ -20,10 +20,33 @@ TKSLIDER_DIR = ROOT_DIR / "tkSliderWidget"
 
 FFMPEG_DIR = ROOT_DIR / "ffmpeg"
 
+CACHE_DIR = ROOT_DIR / ".cache"
+FEATURE_CACHE_DIR = CACHE_DIR / "features"
+
+# Saved calibration (thresholds, TV frame, exposure, camera, marker), shared
+# with the projection scripts.
+PROFILE_PATH = ROOT_DIR / "calibration.npz"
+
 # Camera
 CAM_INDEX = 1                
 CAM_DEVICE_NAME = None        
-PREFERRED_BACKENDS = [cv2.CAP_DSHOW, cv2.CAP_MSMF, cv2.CAP_FFMPEG]
+# cv2.CAP_DSHOW, cv2.CAP_MSMF, cv2.CAP_FFMPEG (plain values: importing cv2 here slows every import)
+PREFERRED_BACKENDS = [700, 1400, 1900]
+# Backends are tried in order, each for at most this long (seconds). The
+# winning source/backend/format is remembered in CAMERA_CACHE unless an
+# earlier backend timed out.
+CAM_OPEN_TIMEOUT = 3.0
+CAMERA_CACHE = CACHE_DIR / "camera.json"
+# Requested capture format; None leaves the driver default.
+CAM_FOURCC = "MJPG"
+CAM_RESOLUTION = (1280, 720)
+CAM_FPS = 30
+CAPTURE_THREADED = True
+CAPTURE_BUFFER_SIZE = 4
+# Several cameras (CapturePool, checked with python -m vision_app.cameras):
+# frames of one set are at most this far apart, in seconds.
+CAM_SOURCES = [CAM_INDEX]
+SYNC_MAX_SKEW = 0.025
 
 
 AUTO_EXPO = 0.25
@@ -31,11 +54,47 @@ EXPO_DEFAULT = -5.0
 EXPO_MIN, EXPO_MAX = -13.0, -1.0
 
 
+# Minimum delay between frames sent to processing on each screen; the UI
+# itself polls for finished results every POLL_DELAY_MS.
 FRAME_DELAY_MS = 100
 MATCH_DELAY_MS = 150
+POLL_DELAY_MS = 15
 
 
 HSV_DEFAULTS = ((100, 130), (100, 255), (50, 255))
 
+# Automatic HSV search (screen 1 "Auto" button): hue window searched, frames
+# compared, ranges checked on them, working resolution and how far (share of
+# the quad size) the border may move between frames.
+AUTOTUNE_HUE_RANGE = (80, 150)
+AUTOTUNE_FRAMES = 5
+AUTOTUNE_CANDIDATES = 8
+AUTOTUNE_MAX_SIDE = 960
+AUTOTUNE_MAX_JITTER = 0.03
 
+
+# Temporal smoothing of the marker quad: "one_euro", "mean" (over
+# HISTORY_LEN frames) or "none".
+QUAD_FILTER = "one_euro"
 HISTORY_LEN = 10
+
+# Per-stage timing (set VISION_TIMING=1). Shown on the alignment screen,
+# written to TIMING_DUMP on F12 and on exit.
+TIMING_ENABLED = os.environ.get("VISION_TIMING", "") not in ("", "0")
+TIMING_WINDOW = 300
+TIMING_DUMP = CACHE_DIR / "timings.json"
+
+# Marker matching: "sift", "sift_flann", "orb", "orb_bf" or "akaze".
+# Binary descriptors (orb, akaze) are the fastest on low-power machines.
+FEATURE_BACKEND = "sift"
+
+# Detect once, then follow the RANSAC inliers with optical flow until
+# the lock degrades below these limits.
+TRACKING_ENABLED = True
+TRACK_MIN_INLIERS = 25
+TRACK_MAX_REPROJ_ERROR = 3.0
+
+# Detection searches around the last marker quad (or the reference frame)
+# grown by this fraction of its size, first at COARSE_SCALE resolution.
+SEARCH_MARGIN = 0.25
+COARSE_SCALE = 0.5
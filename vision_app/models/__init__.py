@@ -1,5 +1,7 @@
 """Data models used across the application"""
 from .thresholds import HsvThresholds
-from .geometry import HomographyResult
+from .geometry import HomographyResult, AlignmentResult, BorderDetection
+from .frame import CapturedFrame, FrameSet
+from .profile import CalibrationProfile
 
-__all__ = ["HsvThresholds", "HomographyResult"]
+__all__ = ["HsvThresholds", "HomographyResult", "AlignmentResult", "BorderDetection", "CapturedFrame", "FrameSet", "CalibrationProfile"]
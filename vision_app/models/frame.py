@@ -0,0 +1,43 @@
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Tuple
+import numpy as np
+
+
+@dataclass(frozen=True)
+class CapturedFrame:
+    """
+    A camera frame as delivered by ``VideoCaptureService``.
+
+    Attributes:
+        image: The BGR frame. Shared between readers, treat it as read-only.
+
+        timestamp: ``time.monotonic()`` value taken right after the grab.
+
+        seq: Grab sequence number, starting at 1 and increasing by one per grabbed frame.
+    """
+    image: np.ndarray
+    timestamp: float
+    seq: int
+
+
+@dataclass(frozen=True)
+class FrameSet:
+    """
+    Frames of several cameras taken at about the same time, from ``CapturePool``.
+
+    Attributes:
+        frames: One ``CapturedFrame`` per camera, in pool order.
+
+        timestamp: Reference time the frames were aligned on.
+
+        skew: Largest difference between the frames' timestamps, in seconds.
+    """
+    frames: Tuple[CapturedFrame, ...]
+    timestamp: float
+    skew: float
+
+    @property
+    def images(self) -> Tuple[np.ndarray, ...]:
+        return tuple(f.image for f in self.frames)
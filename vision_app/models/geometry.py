@@ -1,7 +1,7 @@
 
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import List, Optional
 import numpy as np
 
 
@@ -17,7 +17,63 @@ class HomographyResult:
 
         matches_vis:
             An image (NumPy array) containing visualization of the feature matches between the marker and the current frame, for debugging/inspection.
+            Only built when requested.
+
+        matches: The ratio-test matches between marker (query) and frame (train) keypoints.
+
+        inlier_mask: RANSAC inlier flags, one per entry of ``matches`` (per tracked point when ``tracked``).
+
+        tracked: True when H came from optical-flow tracking rather than a full detection.
+
+        reproj_error: Mean reprojection error of the inliers, in pixels.
     """
     H: Optional[np.ndarray]
     dst_quad: Optional[np.ndarray]
     matches_vis: Optional[np.ndarray]
+    matches: List = field(default_factory=list)
+    inlier_mask: Optional[np.ndarray] = None
+    tracked: bool = False
+    reproj_error: Optional[float] = None
+
+    @property
+    def num_inliers(self) -> int:
+        return 0 if self.inlier_mask is None else int(np.count_nonzero(self.inlier_mask))
+
+
+@dataclass
+class AlignmentResult:
+    """
+    Everything the alignment screen needs for one camera frame.
+
+    Attributes:
+        homography: The marker match for the frame.
+
+        overlap, angle_x, angle_y: Output of ``coverage_and_angles`` (None when unavailable).
+
+        matches_vis: Match visualization, or the raw frame when matching produced none.
+
+        estimation_vis: The frame with the detected marker (blue) and reference frame (green) drawn.
+    """
+    homography: HomographyResult
+    overlap: Optional[float] = None
+    angle_x: Optional[float] = None
+    angle_y: Optional[float] = None
+    matches_vis: Optional[np.ndarray] = None
+    estimation_vis: Optional[np.ndarray] = None
+
+
+@dataclass
+class BorderDetection:
+    """
+    Result of the HSV border detection on one frame.
+
+    Attributes:
+        mask: The cleaned binary HSV mask (uint8, 0/255).
+
+        quad: The biggest inner quadrilateral of the mask (4x1x2 contour), or None.
+
+        annotated: The BGR frame with ``quad`` drawn in green, when requested.
+    """
+    mask: np.ndarray
+    quad: Optional[np.ndarray]
+    annotated: Optional[np.ndarray] = None
@@ -2,53 +2,215 @@ from __future__ import annotations
 from typing import Tuple, Optional
 import numpy as np
 
-try:
-    from shapely.geometry import Polygon  
-    _HAS_SHAPELY = True
-except Exception:
-    Polygon = None  
-    _HAS_SHAPELY = False
-
 
 def order_points_clockwise(pts: np.ndarray) -> np.ndarray:
     """
     Reorder a set of 4 points into a consistent clockwise order:
     top-left, top-right, bottom-right, bottom-left.
     """
-    pts = np.asarray(pts, dtype="float32").reshape(4, 2)
-    rect = np.zeros((4, 2), dtype="float32")
-    s = pts.sum(axis=1)
-    rect[0] = pts[np.argmin(s)]   # top-left
-    rect[2] = pts[np.argmax(s)]   # bottom-right
-    diff = np.diff(pts, axis=1)
-    rect[1] = pts[np.argmin(diff)]  # top-right
-    rect[3] = pts[np.argmax(diff)]  # bottom-left
+    return order_quads_clockwise(np.asarray(pts, dtype="float32").reshape(1, 4, 2))[0].astype("float32")
+
+
+def order_quads_clockwise(quads: np.ndarray) -> np.ndarray:
+    """``order_points_clockwise`` over an (N, 4, 2) array."""
+    quads = np.asarray(quads, dtype=np.float64).reshape(-1, 4, 2)
+    rows = np.arange(len(quads))
+    s = quads.sum(axis=2)
+    diff = quads[:, :, 1] - quads[:, :, 0]
+    rect = np.empty_like(quads)
+    rect[:, 0] = quads[rows, np.argmin(s, axis=1)]     # top-left
+    rect[:, 1] = quads[rows, np.argmin(diff, axis=1)]  # top-right
+    rect[:, 2] = quads[rows, np.argmax(s, axis=1)]     # bottom-right
+    rect[:, 3] = quads[rows, np.argmax(diff, axis=1)]  # bottom-left
     return rect
 
 
-def coverage_and_angles(ref_quad: np.ndarray, marker_quad: np.ndarray) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+def _cross(o: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """z of (a - o) x (b - o), broadcast over leading axes."""
+    return (a[..., 0] - o[..., 0]) * (b[..., 1] - o[..., 1]) - (a[..., 1] - o[..., 1]) * (b[..., 0] - o[..., 0])
+
+
+def polygon_areas(polys: np.ndarray, counts: np.ndarray | None = None) -> np.ndarray:
+    """Signed shoelace areas of (N, M, 2) polygons, each using its first ``counts[i]`` vertices."""
+    n, m = polys.shape[:2]
+    counts = np.full(n, m) if counts is None else counts
+    idx = np.arange(m)
+    nxt = polys[np.arange(n)[:, None], (idx[None, :] + 1) % np.maximum(counts, 1)[:, None]]
+    terms = polys[..., 0] * nxt[..., 1] - nxt[..., 0] * polys[..., 1]
+    return 0.5 * np.where(idx[None, :] < counts[:, None], terms, 0.0).sum(axis=1)
+
+
+def _segments_cross(p1, p2, q1, q2) -> np.ndarray:
+    d1, d2 = _cross(q1, q2, p1), _cross(q1, q2, p2)
+    d3, d4 = _cross(p1, p2, q1), _cross(p1, p2, q2)
+    return (d1 * d2 < 0) & (d3 * d4 < 0)
+
+
+def _quads_simple(quads: np.ndarray) -> np.ndarray:
+    """Non self-intersecting with a non-zero area."""
+    p = [quads[:, i] for i in range(4)]
+    crossed = _segments_cross(p[0], p[1], p[2], p[3]) | _segments_cross(p[1], p[2], p[3], p[0])
+    return ~crossed & (np.abs(polygon_areas(quads)) > 0)
+
+
+def _corners_distinct(quads: np.ndarray) -> np.ndarray:
+    i, j = np.triu_indices(4, k=1)
+    return np.all(np.any(quads[:, i] != quads[:, j], axis=2), axis=1)
+
+
+def _clip(polys: np.ndarray, counts: np.ndarray, a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """One Sutherland-Hodgman step: keep the part of each polygon left of a->b."""
+    n, m = polys.shape[:2]
+    rows = np.arange(n)
+    out = np.zeros((n, 2 * m, 2))
+    out_counts = np.zeros(n, dtype=np.int64)
+    safe_counts = np.maximum(counts, 1)
+    for i in range(m):
+        valid = i < counts
+        cur = polys[:, i]
+        prev = polys[rows, (i - 1) % safe_counts]
+        s_cur, s_prev = _cross(a, b, cur), _cross(a, b, prev)
+        cur_in, prev_in = s_cur >= 0, s_prev >= 0
+
+        crossing = valid & (cur_in != prev_in)
+        denom = np.where(crossing, s_prev - s_cur, 1.0)
+        t = np.where(crossing, s_prev / denom, 0.0)
+        hit = prev + t[:, None] * (cur - prev)
+        out[rows[crossing], out_counts[crossing]] = hit[crossing]
+        out_counts += crossing
+
+        keep = valid & cur_in
+        out[rows[keep], out_counts[keep]] = cur[keep]
+        out_counts += keep
+    width = max(1, int(out_counts.max(initial=0)))
+    return out[:, :width], out_counts
+
+
+def _clip_area(subjects: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    polys = subjects
+    counts = np.full(len(polys), polys.shape[1], dtype=np.int64)
+    for k in range(3):
+        polys, counts = _clip(polys, counts, triangles[:, k], triangles[:, (k + 1) % 3])
+    return np.abs(polygon_areas(polys, counts))
+
+
+def intersection_areas(subjects: np.ndarray, clippers: np.ndarray) -> np.ndarray:
+    """
+    Areas of ``subjects`` ∩ ``clippers`` for (N, 4, 2) simple quads.
+
+    Each clipper is split into two triangles along the diagonal through its
+    reflex vertex (any diagonal when convex), so Sutherland-Hodgman clipping
+    against convex pieces also covers concave quads.
+    """
+    subjects = np.asarray(subjects, dtype=np.float64)
+    clippers = np.asarray(clippers, dtype=np.float64)
+    negative = polygon_areas(clippers) < 0
+    clippers = np.where(negative[:, None, None], clippers[:, ::-1], clippers)
+
+    rows = np.arange(len(clippers))[:, None]
+    turns = _cross(np.roll(clippers, 1, axis=1), clippers, np.roll(clippers, -1, axis=1))
+    r = np.argmin(turns, axis=1)[:, None]
+    first = clippers[rows, (r + np.arange(3)) % 4]
+    second = clippers[rows, (r + np.array([2, 3, 4])) % 4]
+    return _clip_area(subjects, first) + _clip_area(subjects, second)
+
+
+def quad_homographies(src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """Exact homographies (N, 3, 3) mapping each 4-point ``src`` onto ``dst``; NaN when degenerate."""
+    src = np.asarray(src, dtype=np.float64).reshape(-1, 4, 2)
+    dst = np.asarray(dst, dtype=np.float64).reshape(-1, 4, 2)
+    n = len(src)
+    x, y = src[..., 0], src[..., 1]
+    u, v = dst[..., 0], dst[..., 1]
+    zeros, ones = np.zeros_like(x), np.ones_like(x)
+    rows_u = np.stack([x, y, ones, zeros, zeros, zeros, -u * x, -u * y], axis=2)
+    rows_v = np.stack([zeros, zeros, zeros, x, y, ones, -v * x, -v * y], axis=2)
+    A = np.concatenate([rows_u, rows_v], axis=1)
+    b = np.concatenate([u, v], axis=1)
+
+    h = np.full((n, 8), np.nan)
+    try:
+        h[:] = np.linalg.solve(A, b[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        for i in range(n):
+            try:
+                h[i] = np.linalg.solve(A[i], b[i])
+            except np.linalg.LinAlgError:
+                pass
+    return np.concatenate([h, np.ones((n, 1))], axis=1).reshape(n, 3, 3)
+
+
+def rect_to_quad_homography(width: float, height: float, quad: np.ndarray) -> np.ndarray:
+    """Homography from a ``width`` x ``height`` image onto ``quad`` (corners matched after ordering)."""
+    rect = np.float64([[0, 0], [width, 0], [width, height], [0, height]])
+    return quad_homographies(rect, order_quads_clockwise(quad))[0]
+
+
+def tilt_angles(H: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Rotation of the x and y axes under each (N, 3, 3) homography, in degrees."""
+    H = np.asarray(H, dtype=np.float64).reshape(-1, 3, 3)
+    H = H / H[:, 2:3, 2:3]
+    angle_x = np.degrees(np.arctan2(H[:, 1, 0], H[:, 0, 0]))
+    angle_y = np.degrees(np.arctan2(H[:, 1, 1], H[:, 0, 1]))
+    return angle_x, angle_y
+
+
+def coverage_and_angles_batch(ref_quads: np.ndarray, marker_quads: np.ndarray,
+                              H: np.ndarray | None = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    ``coverage_and_angles`` over N quad pairs at once.
+
+    Returns (overlap %, angle_x, angle_y) arrays of shape (N,), NaN where a
+    value is not available (degenerate quads). ``H`` optionally provides the
+    marker-to-reference homographies, skipping their estimation.
+    """
+    rq = order_quads_clockwise(ref_quads)
+    mq = order_quads_clockwise(marker_quads)
+
+    ref_area = np.abs(polygon_areas(rq))
+    valid = _quads_simple(rq) & _quads_simple(mq)
+    overlap = np.full(len(rq), np.nan)
+    if valid.any():
+        overlap[valid] = intersection_areas(rq[valid], mq[valid]) / ref_area[valid] * 100.0
+
+    if H is None:
+        H = quad_homographies(mq, rq)
+    angle_x, angle_y = tilt_angles(H)
+    # Ordering collapses some degenerate quads onto repeated corners: no meaningful tilt then.
+    distinct = _corners_distinct(rq) & _corners_distinct(mq)
+    angle_x[~distinct] = np.nan
+    angle_y[~distinct] = np.nan
+    return overlap, angle_x, angle_y
+
+
+def coverage_and_angles(ref_quad: np.ndarray, marker_quad: np.ndarray,
+                        H: np.ndarray | None = None) -> Tuple[Optional[float], Optional[float], Optional[float]]:
     """
     Compute the overlap percentage and approximate orientation angles between
     a reference quadrilateral and a detected marker quadrilateral.
+    ``H`` is the marker-to-reference homography, when already known.
+
+    Convex quads, the usual case, take a direct single-pair path; anything
+    else goes through ``coverage_and_angles_batch``.
     """
-    recouvrement, angle_x, angle_y = None, None, None
-    try:
-        rq = order_points_clockwise(ref_quad.reshape(4, 2))
-        mq = order_points_clockwise(marker_quad.reshape(4, 2))
-
-        if _HAS_SHAPELY:
-            poly_cadre = Polygon(rq)
-            poly_marker = Polygon(mq)
-            if poly_cadre.is_valid and poly_marker.is_valid and poly_cadre.area > 0:
-                intersection = poly_cadre.intersection(poly_marker).area
-                recouvrement = (intersection / poly_cadre.area) * 100.0
-
-        import cv2
-        H, _ = cv2.findHomography(mq, rq)
-        if H is not None:
-            r1, r2 = H[:, 0], H[:, 1]
-            angle_x = float(np.degrees(np.arctan2(r1[1], r1[0])))
-            angle_y = float(np.degrees(np.arctan2(r2[1], r2[0])))
-    except Exception:
-        pass
-    return recouvrement, angle_x, angle_y
+    import cv2  # here, so importing the models does not load OpenCV
+    rq = order_points_clockwise(ref_quad)
+    mq = order_points_clockwise(marker_quad)
+    if cv2.isContourConvex(rq) and cv2.isContourConvex(mq) and _corners_distinct(np.stack([rq, mq])).all():
+        ref_area = cv2.contourArea(rq)
+        if ref_area > 0 and cv2.contourArea(mq) > 0:
+            overlap = cv2.intersectConvexConvex(rq, mq)[0] / ref_area * 100.0
+            if H is None:
+                H = cv2.getPerspectiveTransform(mq, rq)
+            angle_x, angle_y = tilt_angles(H)
+            return float(overlap), _finite(angle_x[0]), _finite(angle_y[0])
+
+    overlap, angle_x, angle_y = coverage_and_angles_batch(
+        np.reshape(ref_quad, (1, 4, 2)), np.reshape(marker_quad, (1, 4, 2)),
+        None if H is None else np.reshape(H, (1, 3, 3)),
+    )
+    return _finite(overlap[0]), _finite(angle_x[0]), _finite(angle_y[0])
+
+
+def _finite(value) -> Optional[float]:
+    return float(value) if np.isfinite(value) else None
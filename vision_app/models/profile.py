@@ -0,0 +1,105 @@
+
+from __future__ import annotations
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+import numpy as np
+from .thresholds import HsvThresholds
+
+PROFILE_VERSION = 1
+
+
+@dataclass
+class CalibrationProfile:
+    """
+    Everything a calibration session produces, saved as one uncompressed ``.npz``.
+
+    Attributes:
+        thresholds: HSV range of the TV border.
+
+        ref_quad: (4, 2) TV frame found on screen 1, in camera pixels.
+
+        exposure: Camera exposure value.
+
+        camera_index / camera_device / camera_backend: The source that was
+            opened (``cv2.CAP_*`` backend id, -1 when unknown).
+
+        marker_gray: The marker image the descriptors belong to.
+
+        marker_detector: Feature detector identity (``FeatureBackend.ident``).
+
+        marker_keypoints: (N, 7) array, see ``keypoints_to_array``.
+
+        marker_descriptors: Descriptors of ``marker_keypoints``, or None.
+
+        homography: Last marker-image -> camera homography seen on screen 2.
+    """
+    thresholds: HsvThresholds
+    ref_quad: Optional[np.ndarray] = None
+    exposure: float = 0.0
+    camera_index: int = 0
+    camera_device: Optional[str] = None
+    camera_backend: int = -1
+    marker_gray: Optional[np.ndarray] = None
+    marker_detector: str = ""
+    marker_keypoints: np.ndarray = field(default_factory=lambda: np.empty((0, 7)))
+    marker_descriptors: Optional[np.ndarray] = None
+    homography: Optional[np.ndarray] = None
+
+    @property
+    def marker_size(self) -> Optional[tuple]:
+        """(width, height) of the marker image."""
+        if self.marker_gray is None:
+            return None
+        h, w = self.marker_gray.shape[:2]
+        return w, h
+
+    def save(self, path: Path) -> None:
+        """Write atomically; arrays are stored uncompressed so they load without a decode step."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "version": PROFILE_VERSION,
+            "thresholds": [list(self.thresholds.h), list(self.thresholds.s), list(self.thresholds.v)],
+            "exposure": self.exposure,
+            "camera_index": self.camera_index,
+            "camera_device": self.camera_device,
+            "camera_backend": self.camera_backend,
+            "marker_detector": self.marker_detector,
+        }
+        arrays = {"meta": np.array(json.dumps(meta)), "marker_keypoints": np.asarray(self.marker_keypoints, np.float64)}
+        for name in ("ref_quad", "marker_gray", "marker_descriptors", "homography"):
+            value = getattr(self, name)
+            if value is not None:
+                arrays[name] = np.asarray(value)
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "CalibrationProfile":
+        """Read a profile; raises ``ValueError`` when it is not one this version understands."""
+        with np.load(Path(path), allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != PROFILE_VERSION:
+                raise ValueError(f"Unsupported calibration profile version: {meta.get('version')}")
+
+            def optional(name: str) -> Optional[np.ndarray]:
+                return data[name] if name in data.files else None
+
+            h, s, v = (tuple(r) for r in meta["thresholds"])
+            return cls(
+                thresholds=HsvThresholds(h, s, v),
+                ref_quad=optional("ref_quad"),
+                exposure=float(meta["exposure"]),
+                camera_index=int(meta["camera_index"]),
+                camera_device=meta["camera_device"],
+                camera_backend=int(meta["camera_backend"]),
+                marker_gray=optional("marker_gray"),
+                marker_detector=meta["marker_detector"],
+                marker_keypoints=data["marker_keypoints"],
+                marker_descriptors=optional("marker_descriptors"),
+                homography=optional("homography"),
+            )
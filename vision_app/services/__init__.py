@@ -1,14 +1,37 @@
 
-"""Business services (video, preprocessing, marker detection, rendering)."""
-
-from .video import VideoCaptureService
-from .preprocessing import compute_hsv_mask, biggest_inner_quad, ControleurImage
-from .marker import MarkerTracker, AnalyseurSIFT
-from .drawing import draw_quad, pil_from_bgr, photoimage_fit, GestionAffichage
-
-__all__ = [
-    "VideoCaptureService",
-    "compute_hsv_mask", "biggest_inner_quad", "ControleurImage",
-    "MarkerTracker", "AnalyseurSIFT",
-    "draw_quad", "pil_from_bgr", "photoimage_fit", "GestionAffichage",
-]
+"""Business services (video, preprocessing, marker detection, rendering).
+
+Submodules are imported on first attribute access, so importing one service
+does not load OpenCV features, PIL or Tk for all the others.
+"""
+from importlib import import_module
+
+_EXPORTS = {
+    "VideoCaptureService": "video",
+    "CapturePool": "capture_pool",
+    "compute_hsv_mask": "preprocessing", "mask_from_hsv": "preprocessing", "biggest_inner_quad": "preprocessing",
+    "auto_tune": "autotune",
+    "HsvPreprocessor": "preprocessing", "ControleurImage": "preprocessing",
+    "MarkerTracker": "marker", "MultiMarkerTracker": "marker", "AnalyseurSIFT": "marker",
+    "AlignmentPipeline": "pipeline", "MultiAlignmentPipeline": "pipeline", "FrameSetPipeline": "pipeline",
+    "draw_quad": "drawing", "pil_from_bgr": "drawing", "photoimage_fit": "drawing",
+    "GestionAffichage": "drawing", "PanelRenderer": "drawing",
+    "PreWarp": "prewarp",
+    "VideoDecoder": "playback", "OutputStage": "playback", "FramePacer": "playback",
+    "FrameTransform": "transform",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,153 @@
+
+from __future__ import annotations
+from typing import List, Optional, Sequence, Tuple
+import cv2
+import numpy as np
+from ..config import AUTOTUNE_HUE_RANGE, AUTOTUNE_CANDIDATES, AUTOTUNE_MAX_SIDE, AUTOTUNE_MAX_JITTER
+from ..models import HsvThresholds
+from ..models.metrics import order_quads_clockwise
+from .preprocessing import biggest_inner_quad, mask_from_hsv
+
+# Histogram bins per channel; 8-bit OpenCV hue spans 0..179.
+H_BINS, S_BINS, V_BINS = 45, 32, 32
+H_STEP, S_STEP, V_STEP = 180 // H_BINS, 256 // S_BINS, 256 // V_BINS
+
+# Share of the frame a border mask may plausibly cover.
+MIN_FRACTION, MAX_FRACTION = 0.005, 0.5
+
+
+def _to_hsv(frame: np.ndarray, max_side: int) -> np.ndarray:
+    h, w = frame.shape[:2]
+    scale = max_side / max(h, w)
+    if scale < 1.0:
+        frame = cv2.resize(frame, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+
+
+def hsv_integral(hsvs: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Summed-volume table of the HSV histogram of ``hsvs``: the pixel count of
+    any box of bins is read with 8 lookups, whatever the box size.
+    """
+    hist = None
+    for hsv in hsvs:
+        hist = cv2.calcHist([hsv], [0, 1, 2], None, [H_BINS, S_BINS, V_BINS], [0, 180, 0, 256, 0, 256],
+                            hist=hist, accumulate=hist is not None)
+    integral = np.zeros((H_BINS + 1, S_BINS + 1, V_BINS + 1), np.float64)
+    integral[1:, 1:, 1:] = hist.cumsum(0).cumsum(1).cumsum(2)
+    return integral
+
+
+def box_counts(integral: np.ndarray, h0, h1, s0, s1, v0, v1) -> np.ndarray:
+    """Pixels in the bin boxes [h0, h1) x [s0, s1) x [v0, v1), broadcast over arrays of bounds."""
+    I = integral
+    return (I[h1, s1, v1] - I[h0, s1, v1] - I[h1, s0, v1] - I[h1, s1, v0]
+            + I[h0, s0, v1] + I[h0, s1, v0] + I[h1, s0, v0] - I[h0, s0, v0])
+
+
+def _centre_in_valley(integral: np.ndarray, h0: int, h1: int, s0: int, v0: int,
+                      hue_bins: Tuple[int, int]) -> Tuple[int, int, int, int]:
+    """
+    Move each free bound halfway across the empty bins next to it, so the
+    range keeps a margin on both sides when the colours drift.
+    """
+    inside = box_counts(integral, h0, h1, s0, S_BINS, v0, V_BINS)
+    tolerance = 0.001 * inside
+
+    def room(box, side, step, limit):
+        n = 0
+        while True:
+            moved = list(box)
+            moved[side] += step * (n + 1)
+            if not (limit[0] <= moved[side] <= limit[1]) or moved[0] >= moved[1]:
+                return n
+            if box_counts(integral, moved[0], moved[1], moved[2], S_BINS, moved[3], V_BINS) - inside > tolerance:
+                return n
+            n += 1
+
+    box = (h0, h1, s0, v0)
+    limits = (hue_bins, hue_bins, (0, S_BINS - 1), (0, V_BINS - 1))
+    steps = (-1, 1, -1, -1)
+    return tuple(box[k] + steps[k] * (room(box, k, steps[k], limits[k]) // 2) for k in range(4))
+
+
+def candidate_ranges(integral: np.ndarray, hue_range: Tuple[int, int] = AUTOTUNE_HUE_RANGE,
+                     count: int = AUTOTUNE_CANDIDATES) -> List[HsvThresholds]:
+    """
+    Rank every hue window inside ``hue_range`` crossed with every lower
+    saturation and value bound (upper bounds stay at 255, as the defaults do).
+
+    A range scores high when widening it by one bin on each free side adds
+    few pixels: its bounds sit in a valley of the histogram, so the mask does
+    not change much with lighting. Ranges selecting the same pixel count are
+    treated as one, and each kept range is centred in its valley.
+    """
+    lo = max(0, hue_range[0] // H_STEP)
+    hi = min(H_BINS, -(-(hue_range[1] + 1) // H_STEP))
+    h0, h1, s0, v0 = np.meshgrid(np.arange(lo, hi), np.arange(lo + 1, hi + 1),
+                                 np.arange(S_BINS - 1), np.arange(V_BINS - 1), indexing="ij")
+    valid = h1 > h0
+    h0, h1, s0, v0 = h0[valid], h1[valid], s0[valid], v0[valid]
+
+    total = integral[-1, -1, -1]
+    inside = box_counts(integral, h0, h1, s0, S_BINS, v0, V_BINS)
+    widened = box_counts(integral, np.maximum(h0 - 1, 0), np.minimum(h1 + 1, H_BINS),
+                         np.maximum(s0 - 1, 0), S_BINS, np.maximum(v0 - 1, 0), V_BINS)
+    fraction = inside / max(total, 1.0)
+    stability = np.divide(inside, widened, out=np.zeros_like(inside), where=widened > 0)
+    stability[(fraction < MIN_FRACTION) | (fraction > MAX_FRACTION)] = 0.0
+
+    ranges: List[HsvThresholds] = []
+    seen = set()
+    for i in np.lexsort((-fraction, -stability)):
+        if stability[i] <= 0 or len(ranges) >= count:
+            break
+        if inside[i] in seen:
+            continue
+        seen.add(inside[i])
+        bh0, bh1, bs0, bv0 = _centre_in_valley(integral, int(h0[i]), int(h1[i]), int(s0[i]), int(v0[i]), (lo, hi))
+        ranges.append(HsvThresholds(
+            (bh0 * H_STEP, bh1 * H_STEP - 1),
+            (bs0 * S_STEP, 255),
+            (bv0 * V_STEP, 255),
+        ))
+    return ranges
+
+
+def _stable_area(hsvs: Sequence[np.ndarray], thresholds: HsvThresholds, max_jitter: float) -> float:
+    """Median area of the inner quad over the frames, 0 when it is missing or moves."""
+    quads = []
+    for hsv in hsvs:
+        quad = biggest_inner_quad(mask_from_hsv(hsv, thresholds.h, thresholds.s, thresholds.v))
+        if quad is None:
+            return 0.0
+        quads.append(quad.reshape(4, 2))
+    quads = order_quads_clockwise(np.array(quads))
+    areas = np.array([cv2.contourArea(q.astype(np.float32)) for q in quads])
+    size = float(np.sqrt(np.median(areas)))
+    jitter = np.abs(quads - np.median(quads, axis=0)).max()
+    if size <= 0 or jitter > max_jitter * size:
+        return 0.0
+    return float(np.median(areas))
+
+
+def auto_tune(frames: Sequence[np.ndarray], hue_range: Tuple[int, int] = AUTOTUNE_HUE_RANGE,
+              candidates: int = AUTOTUNE_CANDIDATES, max_side: int = AUTOTUNE_MAX_SIDE,
+              max_jitter: float = AUTOTUNE_MAX_JITTER) -> Optional[HsvThresholds]:
+    """
+    HSV thresholds for the TV border, found from a few BGR frames.
+
+    The histogram ranks all ranges at once; only the best ``candidates`` are
+    run through ``inRange`` and ``biggest_inner_quad`` on every frame. The
+    range whose inner quad is the largest, found on all frames and moving
+    less than ``max_jitter`` of its size, wins. None when no range qualifies.
+    """
+    if not frames:
+        return None
+    hsvs = [_to_hsv(f, max_side) for f in frames]
+    best, best_area = None, 0.0
+    for thresholds in candidate_ranges(hsv_integral(hsvs), hue_range, candidates):
+        area = _stable_area(hsvs, thresholds, max_jitter)
+        if area > best_area:
+            best, best_area = thresholds, area
+    return best
@@ -0,0 +1,84 @@
+
+from __future__ import annotations
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from ..config import PREFERRED_BACKENDS, CAPTURE_BUFFER_SIZE, SYNC_MAX_SKEW
+from ..models.frame import FrameSet
+from .video import STATS_EMA, VideoCaptureService
+
+
+class CapturePool:
+    """
+    Several cameras captured side by side.
+
+    The sources are opened concurrently and each grabs on its own thread, so
+    adding a camera does not slow the others down (OpenCV releases the GIL
+    while reading). ``read_synced`` aligns the cameras' ring buffers on the
+    oldest of their newest frames and returns one frame per camera.
+    """
+
+    def __init__(self, sources: Iterable, backends: Iterable[int] = PREFERRED_BACKENDS,
+                 buffer_size: int = CAPTURE_BUFFER_SIZE) -> None:
+        sources = list(sources)
+        backends = list(backends)
+        with ThreadPoolExecutor(max_workers=max(1, len(sources)), thread_name_prefix="open") as pool:
+            opened = list(pool.map(
+                lambda source: VideoCaptureService(source, backends, threaded=True, buffer_size=buffer_size),
+                sources,
+            ))
+        self.sources: List = []
+        self.cameras: List[VideoCaptureService] = []
+        for source, camera in zip(sources, opened):
+            if camera.is_opened:
+                self.sources.append(source)
+                self.cameras.append(camera)
+            else:
+                print(f"Camera {source} could not be opened")
+                camera.release()
+        self.latency_ms = [0.0] * len(self.cameras)
+        self._last_seqs: Optional[tuple] = None
+        self.sets_delivered = 0
+        self.sets_skewed = 0
+
+    def read_synced(self, max_skew: float = SYNC_MAX_SKEW) -> FrameSet | None:
+        """
+        The newest set of frames not returned yet, None until every camera has
+        a new frame or when the cameras are further than ``max_skew`` seconds apart.
+        """
+        newest = [camera.newest() for camera in self.cameras]
+        if not newest or any(packet is None for packet in newest):
+            return None
+        reference = min(packet.timestamp for packet in newest)
+        frames = tuple(camera.closest(reference) for camera in self.cameras)
+        seqs = tuple(f.seq for f in frames)
+        if seqs == self._last_seqs:
+            return None
+        self._last_seqs = seqs
+        stamps = [f.timestamp for f in frames]
+        skew = max(stamps) - min(stamps)
+        if skew > max_skew:
+            self.sets_skewed += 1
+            return None
+        self.sets_delivered += 1
+        now = time.monotonic()
+        for i, f in enumerate(frames):
+            self.latency_ms[i] += STATS_EMA * ((now - f.timestamp) * 1000.0 - self.latency_ms[i])
+        return FrameSet(frames, reference, skew)
+
+    def stats(self) -> Dict[str, dict]:
+        """Per camera: capture counters, fps, grab time and delivery latency."""
+        return {
+            str(source): {**camera.stats(), "latency_ms": latency}
+            for source, camera, latency in zip(self.sources, self.cameras, self.latency_ms)
+        }
+
+    def release(self) -> None:
+        for camera in self.cameras:
+            camera.release()
+
+    def __len__(self) -> int:
+        return len(self.cameras)
+
+    def __getitem__(self, i: int) -> VideoCaptureService:
+        return self.cameras[i]
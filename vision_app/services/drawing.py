@@ -1,8 +1,11 @@
 from __future__ import annotations
 import cv2
 import numpy as np
+from typing import Dict, Optional, Tuple
 from PIL import Image, ImageTk
 
+Size = Tuple[int, int]
+
 
 def draw_quad(img_bgr: np.ndarray, quad: np.ndarray | None, color=(0, 255, 0), thickness: int = 2) -> np.ndarray:
     out = img_bgr.copy()
@@ -15,11 +18,10 @@ def pil_from_bgr(bgr: np.ndarray) -> Image.Image:
     return Image.fromarray(cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB))
 
 
-def photoimage_fit(img_pil: Image.Image, frame_size: tuple[int, int]) -> ImageTk.PhotoImage | None:
+def fit_size(image_size: Size, frame_size: Size) -> Size:
+    """Largest (w, h) with the aspect ratio of ``image_size`` fitting in ``frame_size``."""
+    iw, ih = image_size
     fw, fh = frame_size
-    if fw < 10 or fh < 10:
-        return None
-    iw, ih = img_pil.size
     r_img = iw / ih
     r_fr = fw / fh
     if r_fr > r_img:
@@ -28,6 +30,14 @@ def photoimage_fit(img_pil: Image.Image, frame_size: tuple[int, int]) -> ImageTk
     else:
         nw = fw
         nh = int(nw / r_img)
+    return max(1, nw), max(1, nh)
+
+
+def photoimage_fit(img_pil: Image.Image, frame_size: tuple[int, int]) -> ImageTk.PhotoImage | None:
+    fw, fh = frame_size
+    if fw < 10 or fh < 10:
+        return None
+    nw, nh = fit_size(img_pil.size, frame_size)
     resized = img_pil.resize((nw, nh), Image.LANCZOS)
     return ImageTk.PhotoImage(resized)
 
@@ -43,15 +53,7 @@ class GestionAffichage:
         frame_height = frame.winfo_height()
         if frame_width < 10 or frame_height < 10:
             return
-        img_width, img_height = image.size
-        img_ratio = img_width / img_height
-        frame_ratio = frame_width / frame_height
-        if frame_ratio > img_ratio:
-            new_height = frame_height
-            new_width = int(new_height * img_ratio)
-        else:
-            new_width = frame_width
-            new_height = int(new_width / img_ratio)
+        new_width, new_height = fit_size(image.size, (frame_width, frame_height))
         resized = image.resize((new_width, new_height), Image.LANCZOS)
         photo = ImageTk.PhotoImage(resized)
         label.config(image=photo)
@@ -66,16 +68,7 @@ class GestionAffichage:
         if target_w < 10 or target_h < 10:
             return
 
-        img_w, img_h = image.size
-        img_ratio = img_w / img_h
-        frame_ratio = target_w / target_h
-
-        if frame_ratio > img_ratio:
-            new_h = target_h
-            new_w = int(new_h * img_ratio)
-        else:
-            new_w = target_w
-            new_h = int(new_w / img_ratio)
+        new_w, new_h = fit_size(image.size, (target_w, target_h))
 
         resized = image.resize((new_w, new_h), Image.LANCZOS)
         photo = ImageTk.PhotoImage(resized)
@@ -83,3 +76,89 @@ class GestionAffichage:
         label.config(image=photo)
         label.image = photo
         label.place(x=(target_w - new_w) // 2,y=(target_h - new_h) // 2,width=new_w,height=new_h)
+
+
+def interpolation_for(scale: float) -> int:
+    """Cheapest interpolation that still looks right for a given resize factor."""
+    if scale < 0.5:
+        return cv2.INTER_AREA
+    if scale == 1.0:
+        return cv2.INTER_NEAREST
+    return cv2.INTER_LINEAR
+
+
+class PanelRenderer:
+    """
+    Displays NumPy frames in one Tk label.
+
+    The label keeps a single ``PhotoImage`` that is updated in place while the
+    displayed size does not change. Resizing and colour conversion happen in
+    OpenCV into reused buffers, fit geometry is cached per (image, panel) size,
+    and a frame whose ``token`` matches the previous one is not redrawn.
+    Panel size comes from ``frame`` (first screen) or a fixed ``size`` (second screen).
+    """
+
+    def __init__(self, label, frame=None, size: Optional[Size] = None) -> None:
+        self.label = label
+        self.frame = frame
+        self.size = size
+        self._geometry: Dict[Tuple[Size, Size], Tuple[Size, int]] = {}
+        self._resized: Optional[np.ndarray] = None
+        self._rgb: Optional[np.ndarray] = None
+        self._photo: Optional[ImageTk.PhotoImage] = None
+        self._placed: Optional[Tuple[int, int, int, int]] = None
+        self._token: Optional[tuple] = None
+
+    def panel_size(self) -> Size:
+        if self.size is not None:
+            return self.size
+        return self.frame.winfo_width(), self.frame.winfo_height()
+
+    def prepare(self, image: np.ndarray, panel: Size, bgr: bool = True) -> np.ndarray | None:
+        """Fit ``image`` (BGR or single channel) into ``panel`` and return it as RGB."""
+        if panel[0] < 10 or panel[1] < 10:
+            return None
+        ih, iw = image.shape[:2]
+        key = ((iw, ih), panel)
+        geometry = self._geometry.get(key)
+        if geometry is None:
+            size = fit_size((iw, ih), panel)
+            geometry = self._geometry[key] = (size, interpolation_for(size[0] / iw))
+        (nw, nh), interpolation = geometry
+
+        shape = (nh, nw) + image.shape[2:]
+        if self._resized is None or self._resized.shape != shape:
+            self._resized = np.empty(shape, np.uint8)
+        if self._rgb is None or self._rgb.shape[:2] != (nh, nw):
+            self._rgb = np.empty((nh, nw, 3), np.uint8)
+
+        cv2.resize(image, (nw, nh), dst=self._resized, interpolation=interpolation)
+        if image.ndim == 2:
+            cv2.cvtColor(self._resized, cv2.COLOR_GRAY2RGB, dst=self._rgb)
+        elif bgr:
+            cv2.cvtColor(self._resized, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        else:
+            np.copyto(self._rgb, self._resized)
+        return self._rgb
+
+    def show(self, image: np.ndarray, token: object = None, bgr: bool = True) -> None:
+        panel = self.panel_size()
+        key = (token, panel, image.shape)
+        if token is not None and key == self._token:
+            return
+        rgb = self.prepare(image, panel, bgr=bgr)
+        if rgb is None:
+            return
+        self._token = key
+        nh, nw = rgb.shape[:2]
+        pil = Image.frombuffer("RGB", (nw, nh), rgb, "raw", "RGB", 0, 1)
+        if self._photo is not None and (self._photo.width(), self._photo.height()) == (nw, nh):
+            self._photo.paste(pil)
+        else:
+            self._photo = ImageTk.PhotoImage(pil)
+            self.label.config(image=self._photo)
+            self.label.image = self._photo
+        placed = ((panel[0] - nw) // 2, (panel[1] - nh) // 2, nw, nh)
+        if placed != self._placed:
+            self.label.place(x=placed[0], y=placed[1], width=nw, height=nh)
+            self._placed = placed
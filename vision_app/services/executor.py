@@ -0,0 +1,58 @@
+
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, List
+
+
+class FrameExecutor:
+    """
+    Runs frame processing jobs off the Tk main loop.
+
+    At most ``max_workers`` jobs are in flight, counting finished jobs whose
+    result has not been polled yet. Submissions beyond that are dropped rather
+    than queued, so the UI always works on the newest frame. Worker threads are
+    enough here: OpenCV releases the GIL in its heavy calls.
+    """
+
+    def __init__(self, max_workers: int = 1, name: str = "vision") -> None:
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._futures: List[Future] = []
+        self.submitted = 0
+        self.dropped = 0
+
+    @property
+    def busy(self) -> bool:
+        return len(self._futures) >= self.max_workers
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> bool:
+        """Start ``fn`` on a worker. Returns False (and counts a drop) when all workers are busy."""
+        if self.busy:
+            self.dropped += 1
+            return False
+        self._futures.append(self._pool.submit(fn, *args, **kwargs))
+        self.submitted += 1
+        return True
+
+    def poll(self) -> Any:
+        """Collect finished jobs and return the result of the most recent one, or None."""
+        done = [f for f in self._futures if f.done()]
+        if not done:
+            return None
+        self._futures = [f for f in self._futures if f not in done]
+        latest = None
+        for future in done:
+            try:
+                latest = future.result()
+            except Exception as e:
+                print(f"Processing error: {e}")
+        return latest
+
+    def drain(self) -> None:
+        """Wait for the jobs in flight and discard their results, e.g. before reconfiguring what they use."""
+        wait(self._futures)
+        self._futures.clear()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._futures.clear()
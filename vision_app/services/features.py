@@ -0,0 +1,178 @@
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import cv2
+import numpy as np
+
+Features = Tuple[List[cv2.KeyPoint], Optional[np.ndarray]]
+
+
+def keypoints_to_array(keypoints) -> np.ndarray:
+    """Pack keypoints as an (N, 7) array: x, y, size, angle, response, octave, class_id."""
+    rows = [(k.pt[0], k.pt[1], k.size, k.angle, k.response, k.octave, k.class_id) for k in keypoints]
+    return np.array(rows, dtype=np.float64).reshape(-1, 7)
+
+
+def keypoints_from_array(arr: np.ndarray) -> List[cv2.KeyPoint]:
+    return [
+        cv2.KeyPoint(float(x), float(y), float(size), float(angle), float(response), int(octave), int(class_id))
+        for x, y, size, angle, response, octave, class_id in np.asarray(arr).reshape(-1, 7)
+    ]
+
+
+class FeatureCache:
+    """
+    On-disk cache of marker keypoints/descriptors.
+
+    Entries are keyed by the marker pixels and the detector identity, so editing
+    the marker image or changing detector parameters never returns stale data.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+
+    @staticmethod
+    def key(gray: np.ndarray, detector_id: str) -> str:
+        digest = hashlib.sha1()
+        digest.update(str(gray.shape).encode())
+        digest.update(np.ascontiguousarray(gray).tobytes())
+        digest.update(detector_id.encode())
+        digest.update(cv2.__version__.encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npz"
+
+    def load(self, key: str) -> Features | None:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                keypoints = keypoints_from_array(data["keypoints"])
+                descriptors = data["descriptors"] if data["descriptors"].size else None
+        except Exception:
+            return None
+        return keypoints, descriptors
+
+    def save(self, key: str, keypoints, descriptors: Optional[np.ndarray]) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self.directory / f"{key}.{os.getpid()}.tmp.npz"
+            np.savez(tmp, keypoints=keypoints_to_array(keypoints),
+                     descriptors=descriptors if descriptors is not None else np.empty((0, 0), np.float32))
+            os.replace(tmp, self._path(key))
+        except Exception:
+            pass
+
+
+def detector_id(name: str, params: dict) -> str:
+    return f"{name}:{json.dumps(params, sort_keys=True)}"
+
+
+def compute_features(detector, gray: np.ndarray, ident: str, cache: FeatureCache | None = None) -> Features:
+    """Run ``detectAndCompute`` on ``gray``, going through ``cache`` when one is given."""
+    key = FeatureCache.key(gray, ident) if cache is not None else None
+    if cache is not None:
+        cached = cache.load(key)
+        if cached is not None:
+            return cached
+    keypoints, descriptors = detector.detectAndCompute(gray, None)
+    keypoints = list(keypoints)
+    if cache is not None:
+        cache.save(key, keypoints, descriptors)
+    return keypoints, descriptors
+
+
+FLANN_INDEX_KDTREE = 1
+FLANN_INDEX_LSH = 6
+
+
+@dataclass(frozen=True)
+class FeatureBackend:
+    """
+    A detector/matcher pairing with its defaults.
+
+    Attributes:
+        name: Registry key.
+
+        detector: ``"SIFT"``, ``"ORB"`` or ``"AKAZE"``.
+
+        matcher: ``"bf"`` (brute force), ``"flann_kdtree"`` (float descriptors) or ``"flann_lsh"`` (binary descriptors).
+
+        ratio: Lowe ratio-test threshold.
+
+        params: Keyword arguments for the OpenCV detector factory.
+    """
+    name: str
+    detector: str
+    matcher: str
+    ratio: float = 0.75
+    params: Dict = field(default_factory=dict)
+
+    @property
+    def binary(self) -> bool:
+        return self.detector in ("ORB", "AKAZE")
+
+    @property
+    def ident(self) -> str:
+        return detector_id(self.detector, self.params)
+
+    def create_detector(self):
+        # Looked up by name: not every OpenCV build ships every detector.
+        factory = getattr(cv2, f"{self.detector}_create", None)
+        if factory is None:
+            raise ValueError(f"This OpenCV build ({cv2.__version__}) has no {self.detector} detector "
+                             f"for the {self.name!r} backend")
+        return factory(**self.params)
+
+    def create_matcher(self):
+        if self.matcher == "flann_kdtree":
+            return cv2.FlannBasedMatcher(dict(algorithm=FLANN_INDEX_KDTREE, trees=5), dict(checks=50))
+        if self.matcher == "flann_lsh":
+            return cv2.FlannBasedMatcher(
+                dict(algorithm=FLANN_INDEX_LSH, table_number=6, key_size=12, multi_probe_level=1), dict(checks=50)
+            )
+        return cv2.BFMatcher(cv2.NORM_HAMMING if self.binary else cv2.NORM_L2)
+
+    def with_params(self, **params) -> "FeatureBackend":
+        return FeatureBackend(self.name, self.detector, self.matcher, self.ratio, {**self.params, **params})
+
+
+SIFT_PARAMS = dict(nfeatures=0, nOctaveLayers=3, contrastThreshold=0.04, edgeThreshold=10.0, sigma=1.6)
+
+FEATURE_BACKENDS: Dict[str, FeatureBackend] = {
+    "sift": FeatureBackend("sift", "SIFT", "bf", 0.75, SIFT_PARAMS),
+    "sift_flann": FeatureBackend("sift_flann", "SIFT", "flann_kdtree", 0.75, SIFT_PARAMS),
+    "orb": FeatureBackend("orb", "ORB", "flann_lsh", 0.8, dict(nfeatures=2000, scaleFactor=1.2, nlevels=8, fastThreshold=20)),
+    "orb_bf": FeatureBackend("orb_bf", "ORB", "bf", 0.8, dict(nfeatures=2000, scaleFactor=1.2, nlevels=8, fastThreshold=20)),
+    "akaze": FeatureBackend("akaze", "AKAZE", "bf", 0.8, dict(threshold=0.001)),
+}
+
+
+def get_backend(backend: "str | FeatureBackend") -> FeatureBackend:
+    if isinstance(backend, FeatureBackend):
+        return backend
+    try:
+        return FEATURE_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown feature backend {backend!r}, expected one of {sorted(FEATURE_BACKENDS)}") from None
+
+
+def ratio_test(knn_matches, ratio: float) -> list:
+    """
+    Lowe ratio test over matches of frame descriptors (query) against a trained
+    marker index (train). Returned matches are flipped so ``queryIdx`` indexes
+    the marker keypoints and ``trainIdx`` the frame keypoints.
+    """
+    good = []
+    for m in knn_matches:
+        if len(m) == 2 and m[0].distance < ratio * m[1].distance:
+            best = m[0]
+            good.append(cv2.DMatch(best.trainIdx, best.queryIdx, best.imgIdx, best.distance))
+    return good
@@ -2,55 +2,398 @@
 from __future__ import annotations
 import cv2
 import numpy as np
-from collections import deque
-from typing import Deque
+from pathlib import Path
+from typing import List, Tuple
+from ..config import (
+    FEATURE_CACHE_DIR, FEATURE_BACKEND, TRACKING_ENABLED, TRACK_MIN_INLIERS, TRACK_MAX_REPROJ_ERROR,
+    SEARCH_MARGIN, COARSE_SCALE, QUAD_FILTER,
+)
 from ..models.geometry import HomographyResult
+from ..utils.timing import NULL_TIMER, StageTimer
+from .smoothing import QuadFilter, make_quad_filter
+from .features import (
+    FEATURE_BACKENDS, FeatureBackend, FeatureCache, Features, compute_features, get_backend, ratio_test,
+)
+
+LK_PARAMS = dict(winSize=(21, 21), maxLevel=3,
+                 criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 30, 0.01))
+
+
+def reprojection_error(H: np.ndarray, src: np.ndarray, dst: np.ndarray) -> float:
+    """Mean distance between ``H``-projected ``src`` points and ``dst``."""
+    if len(src) == 0:
+        return float("inf")
+    proj = cv2.perspectiveTransform(src.reshape(-1, 1, 2), H)
+    return float(np.mean(np.linalg.norm(proj.reshape(-1, 2) - dst.reshape(-1, 2), axis=1)))
+
+
+Rect = Tuple[int, int, int, int]
+
+MIN_COARSE_SIDE = 160
+
+
+def search_window(quad: np.ndarray, shape: Tuple[int, int], margin: float) -> Rect | None:
+    """
+    Bounding box ``(x0, y0, x1, y1)`` of ``quad`` grown by ``margin`` times its size
+    and clipped to a frame of ``shape``. None when that covers most of the frame.
+    """
+    fh, fw = shape[:2]
+    pts = np.asarray(quad, dtype=np.float32).reshape(-1, 2)
+    (x0, y0), (x1, y1) = pts.min(axis=0), pts.max(axis=0)
+    mx, my = (x1 - x0) * margin, (y1 - y0) * margin
+    x0, y0 = max(0, int(x0 - mx)), max(0, int(y0 - my))
+    x1, y1 = min(fw, int(np.ceil(x1 + mx))), min(fh, int(np.ceil(y1 + my)))
+    if x1 - x0 < 16 or y1 - y0 < 16 or (x1 - x0) * (y1 - y0) > 0.8 * fw * fh:
+        return None
+    return x0, y0, x1, y1
+
 
 class MarkerTracker:
-    def __init__(self, history_len: int = 10) -> None:
-        self.sift = cv2.SIFT_create()
-        self.bf = cv2.BFMatcher()
-        self.history: Deque[np.ndarray] = deque(maxlen=history_len)
+    """
+    Locates the marker image in camera frames.
+
+    With ``tracking`` enabled, a detection whose inliers are numerous and
+    accurate enough becomes a lock: following frames move the inlier points
+    with pyramidal Lucas-Kanade and refit H on them, and full detection only
+    runs again once the tracked inliers or their reprojection error degrade.
+
+    Detection first looks in a window around the last marker quad (or the
+    reference frame) at reduced resolution and escalates to full resolution,
+    then to the whole frame, only while no confident estimate is found. After
+    a loss the next frame starts from the whole frame.
+
+    The returned quad goes through ``quad_filter``, weighted by the inlier
+    count and reprojection error of each estimate and reset on loss.
+    """
+
+    def __init__(self, history_len: int = 10, backend: "str | FeatureBackend" = FEATURE_BACKEND,
+                 cache_dir: Path | None = FEATURE_CACHE_DIR, tracking: bool = TRACKING_ENABLED,
+                 min_inliers: int = TRACK_MIN_INLIERS, max_reproj_error: float = TRACK_MAX_REPROJ_ERROR,
+                 search_margin: float = SEARCH_MARGIN, coarse_scale: float = COARSE_SCALE,
+                 quad_filter: "QuadFilter | str | None" = QUAD_FILTER, timer: StageTimer = NULL_TIMER) -> None:
+        self.timer = timer
+        self.backend = get_backend(backend)
+        self._detector = None
+        self._matcher = None
+        self.cache = FeatureCache(cache_dir) if cache_dir is not None else None
+        self.quad_filter = quad_filter if isinstance(quad_filter, QuadFilter) else make_quad_filter(quad_filter, history_len)
         self.marker_gray: np.ndarray | None = None
+        self.marker_kp = None
+        self.marker_des: np.ndarray | None = None
+        self.tracking = tracking
+        self.min_inliers = min_inliers
+        self.max_reproj_error = max_reproj_error
+        self.search_margin = search_margin
+        self.coarse_scale = coarse_scale
+        self.ref_quad: np.ndarray | None = None
+        self._last_quad: np.ndarray | None = None
+        self._lost = False
+        self.reset_tracking()
+
+    @property
+    def detector(self):
+        """Created on first use: constructing SIFT & co. is not free and not needed before a marker is loaded."""
+        if self._detector is None:
+            self._detector = self.backend.create_detector()
+        return self._detector
+
+    @detector.setter
+    def detector(self, detector) -> None:
+        self._detector = detector
+
+    @property
+    def matcher(self):
+        if self._matcher is None:
+            self._matcher = self.backend.create_matcher()
+        return self._matcher
+
+    def set_reference(self, ref_quad: np.ndarray | None) -> None:
+        """Hint where the marker should appear, used until it is first found."""
+        self.ref_quad = None if ref_quad is None else np.float32(ref_quad).reshape(4, 2)
+
+    def reset(self) -> None:
+        """Forget every previous frame: last position, lost state, smoothing and tracking."""
+        self._last_quad = None
+        self._lost = False
+        self.quad_filter.reset()
+        self.reset_tracking()
 
-    def load_marker(self, bgr: np.ndarray) -> None:
-        self.marker_gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+    def reset_tracking(self) -> None:
+        self._prev_gray: np.ndarray | None = None
+        self._track_src: np.ndarray | None = None
+        self._track_dst: np.ndarray | None = None
 
-    def match(self, frame_bgr: np.ndarray) -> HomographyResult:
+    @property
+    def is_locked(self) -> bool:
+        return self._track_dst is not None
+
+    def load_marker(self, image: np.ndarray, features: Features | None = None, index: bool = True) -> None:
+        """
+        Set the marker (BGR or gray). ``features`` skips the extraction when
+        already known for this backend; ``index=False`` leaves the matcher
+        untrained, for markers matched through a shared index.
+        """
+        self.marker_gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        if features is None:
+            features = compute_features(self.detector, self.marker_gray, self.backend.ident, self.cache)
+        self.marker_kp, self.marker_des = features
+        self.reset()
+        # The marker is the fixed side of every match: index it once.
+        self.matcher.clear()
+        if index and self.marker_des is not None and len(self.marker_des) >= 2:
+            self.matcher.add([self.marker_des])
+            self.matcher.train()
+
+    @property
+    def marker_features(self) -> Features:
+        return self.marker_kp, self.marker_des
+
+    def match(self, frame_bgr: np.ndarray, visualize: bool = False) -> HomographyResult:
+        """
+        Estimate the marker homography for a frame: by optical flow while locked,
+        otherwise by one feature extraction matched against the cached marker
+        features. ``visualize`` also draws the matches.
+        """
         if self.marker_gray is None:
             return HomographyResult(None, None, None)
-        kp1, des1 = self.sift.detectAndCompute(self.marker_gray, None)
-        kp2, des2 = self.sift.detectAndCompute(frame_bgr, None)
-        if des1 is None or des2 is None:
+        gray = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY) if frame_bgr.ndim == 3 else frame_bgr
+        if self.tracking and self.is_locked:
+            result = self._track(gray, frame_bgr, visualize)
+            if result is not None:
+                return result
+            self.reset_tracking()
+        return self._detect(gray, frame_bgr, visualize)
+
+    def _search_plan(self, shape: Tuple[int, int]) -> List[Tuple[Rect, float]]:
+        fh, fw = shape[:2]
+        full = (0, 0, fw, fh)
+        hint = self._last_quad if self._last_quad is not None else self.ref_quad
+        roi = None if self._lost or hint is None else search_window(hint, shape, self.search_margin)
+        plan = []
+        for rect in ([roi] if roi is not None else []) + [full]:
+            x0, y0, x1, y1 = rect
+            if self.coarse_scale < 1.0 and min(x1 - x0, y1 - y0) * self.coarse_scale >= MIN_COARSE_SIDE:
+                plan.append((rect, self.coarse_scale))
+            plan.append((rect, 1.0))
+        return plan
+
+    def _detect(self, gray: np.ndarray, frame_bgr: np.ndarray, visualize: bool) -> HomographyResult:
+        best, best_inliers = None, -1
+        for rect, scale in self._search_plan(gray.shape):
+            found = self._detect_in(gray, rect, scale)
+            if found is None:
+                continue
+            inliers = int(found[2].sum()) if found[0] is not None else 0
+            if inliers > best_inliers:
+                best, best_inliers = found, inliers
+            if inliers >= self.min_inliers:
+                break
+        return self._accept(best, gray, frame_bgr, visualize)
+
+    def _accept(self, found, gray: np.ndarray, frame_bgr: np.ndarray, visualize: bool) -> HomographyResult:
+        """Turn a detection (see ``_detect_in``) into a result, locking on it when it is good enough."""
+        if found is None:
+            self._lost = True
+            self.quad_filter.reset()
             return HomographyResult(None, None, None)
-        good = []
-        for m in self.bf.knnMatch(des1, des2, k=2):
-            if len(m) == 2 and m[0].distance < 0.75 * m[1].distance:
-                good.append(m[0])
-        matches_vis = cv2.drawMatches(self.marker_gray, kp1, frame_bgr, kp2, good, None,
-                                      flags=cv2.DrawMatchesFlags_NOT_DRAW_SINGLE_POINTS)
+        H, good, inlier_mask, src, dst, kp2 = found
+
+        matches_vis = None
+        if visualize:
+            with self.timer.stage("draw"):
+                matches_vis = cv2.drawMatches(self.marker_gray, self.marker_kp, frame_bgr, kp2, good, None,
+                                              flags=cv2.DrawMatchesFlags_NOT_DRAW_SINGLE_POINTS)
+        self._lost = H is None
+        if H is None:
+            self.quad_filter.reset()
+            return HomographyResult(None, None, matches_vis, good, inlier_mask)
+        error = reprojection_error(H, src[inlier_mask], dst[inlier_mask])
+        if self.tracking and int(inlier_mask.sum()) >= self.min_inliers and error <= self.max_reproj_error:
+            self._prev_gray = gray
+            self._track_src = src[inlier_mask]
+            self._track_dst = dst[inlier_mask]
+        quad = self._smoothed_quad(H, self._confidence(int(inlier_mask.sum()), error))
+        return HomographyResult(H, quad, matches_vis, good, inlier_mask, reproj_error=error)
+
+    def _detect_in(self, gray: np.ndarray, rect: Rect, scale: float):
+        """
+        Detect and match inside ``rect`` resampled by ``scale``. Returned frame
+        points and keypoints are in full-frame coordinates; None when nothing matched.
+        """
+        x0, y0, x1, y1 = rect
+        view = gray[y0:y1, x0:x1]
+        if scale != 1.0:
+            view = cv2.resize(view, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        des1 = self.marker_des
+        with self.timer.stage("features"):
+            kp2, des2 = self.detector.detectAndCompute(view, None)
+        if des1 is None or des2 is None or len(des1) < 2 or len(des2) < 2:
+            return None
+        if rect[:2] != (0, 0) or scale != 1.0:
+            kp2 = [cv2.KeyPoint(k.pt[0] / scale + x0, k.pt[1] / scale + y0, k.size / scale, k.angle,
+                                k.response, k.octave, k.class_id) for k in kp2]
+        with self.timer.stage("matching"):
+            good = ratio_test(self.matcher.knnMatch(des2, k=2), self.backend.ratio)
+        return self._fit(good, kp2)
+
+    def _fit(self, good: list, kp2):
+        """RANSAC homography of ``good`` marker -> frame matches, as returned by ``_detect_in``."""
         if len(good) < 4:
-            return HomographyResult(None, None, matches_vis)
+            return None, good, None, None, None, kp2
+        kp1 = self.marker_kp
         src = np.float32([kp1[m.queryIdx].pt for m in good]).reshape(-1, 1, 2)
         dst = np.float32([kp2[m.trainIdx].pt for m in good]).reshape(-1, 1, 2)
-        H, _ = cv2.findHomography(src, dst, cv2.RANSAC, 5.0)
-        dst_quad = None
-        if H is not None:
-            h, w = self.marker_gray.shape
-            quad = np.float32([[0, 0], [0, h], [w, h], [w, 0]]).reshape(-1, 1, 2)
-            proj = cv2.perspectiveTransform(quad, H)
-            self.history.append(proj.reshape(4, 2))
-            avg = np.mean(np.array(self.history), axis=0).reshape(-1, 1, 2)
-            dst_quad = avg
-        return HomographyResult(H, dst_quad, matches_vis)
+        with self.timer.stage("ransac"):
+            H, inliers = cv2.findHomography(src, dst, cv2.RANSAC, 5.0)
+        inlier_mask = inliers.ravel().astype(bool) if inliers is not None else None
+        return H, good, inlier_mask, src, dst, kp2
+
+    def _track(self, gray: np.ndarray, frame_bgr: np.ndarray, visualize: bool) -> HomographyResult | None:
+        """Follow the locked points into ``gray``; None when the lock is lost."""
+        with self.timer.stage("flow"):
+            pts, status, _ = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, self._track_dst, None, **LK_PARAMS)
+        if pts is None:
+            return None
+        ok = status.ravel() == 1
+        src, dst = self._track_src[ok], pts[ok]
+        if len(dst) < self.min_inliers:
+            return None
+        with self.timer.stage("ransac"):
+            H, inliers = cv2.findHomography(src, dst, cv2.RANSAC, 5.0)
+        if H is None:
+            return None
+        inlier_mask = inliers.ravel().astype(bool)
+        if int(inlier_mask.sum()) < self.min_inliers:
+            return None
+        error = reprojection_error(H, src[inlier_mask], dst[inlier_mask])
+        if error > self.max_reproj_error:
+            return None
+        self._prev_gray = gray
+        self._track_src = src[inlier_mask]
+        self._track_dst = dst[inlier_mask]
+
+        matches_vis = None
+        if visualize:
+            with self.timer.stage("draw"):
+                kp1 = [cv2.KeyPoint(float(x), float(y), 1) for x, y in src.reshape(-1, 2)]
+                kp2 = [cv2.KeyPoint(float(x), float(y), 1) for x, y in dst.reshape(-1, 2)]
+                links = [cv2.DMatch(int(i), int(i), 0.0) for i in np.flatnonzero(inlier_mask)]
+                matches_vis = cv2.drawMatches(self.marker_gray, kp1, frame_bgr, kp2, links, None,
+                                              flags=cv2.DrawMatchesFlags_NOT_DRAW_SINGLE_POINTS)
+        quad = self._smoothed_quad(H, self._confidence(int(inlier_mask.sum()), error))
+        return HomographyResult(H, quad, matches_vis, [], inlier_mask, tracked=True, reproj_error=error)
+
+    def _confidence(self, inliers: int, error: float) -> float:
+        """1 for an estimate well above the lock limits, falling towards 0 as it degrades."""
+        support = min(1.0, inliers / (2.0 * max(1, self.min_inliers)))
+        accuracy = self.max_reproj_error / (self.max_reproj_error + error)
+        return support * accuracy
+
+    def _smoothed_quad(self, H: np.ndarray, confidence: float = 1.0) -> np.ndarray:
+        h, w = self.marker_gray.shape
+        quad = np.float32([[0, 0], [0, h], [w, h], [w, 0]]).reshape(-1, 1, 2)
+        proj = cv2.perspectiveTransform(quad, H)
+        self._last_quad = proj.reshape(4, 2)
+        return self.quad_filter.update(self._last_quad, confidence).reshape(-1, 1, 2)
+
+
+class MultiMarkerTracker:
+    """
+    Locates several distinct markers in the same camera frames.
+
+    Each marker keeps its own ``MarkerTracker`` state (optical-flow lock,
+    smoothing, reference frame). Markers that are not locked are detected
+    together: the frame features are extracted once, on the whole frame, and
+    matched against one index holding the descriptors of every marker; each
+    match is routed to its marker through ``imgIdx``. The ratio test runs across
+    markers, so they must be different images.
+    """
+
+    def __init__(self, backend: "str | FeatureBackend" = FEATURE_BACKEND, timer: StageTimer = NULL_TIMER,
+                 **tracker_options) -> None:
+        self.backend = get_backend(backend)
+        self.timer = timer
+        self.detector = self.backend.create_detector()
+        self.matcher = self.backend.create_matcher()
+        self.tracker_options = tracker_options
+        self.trackers: List[MarkerTracker] = []
+        self.names: List[str] = []
+        self._indexed: List[int] = []
+
+    def add_marker(self, name: str, image: np.ndarray, ref_quad: np.ndarray | None = None,
+                   features: Features | None = None) -> MarkerTracker:
+        tracker = MarkerTracker(backend=self.backend, timer=self.timer, **self.tracker_options)
+        tracker.detector = self.detector
+        tracker.load_marker(image, features, index=False)
+        tracker.set_reference(ref_quad)
+        self.trackers.append(tracker)
+        self.names.append(name)
+        self._build_index()
+        return tracker
+
+    def set_reference(self, name: str, ref_quad: np.ndarray | None) -> None:
+        self.trackers[self.names.index(name)].set_reference(ref_quad)
+
+    @property
+    def ref_quads(self) -> List[np.ndarray | None]:
+        return [t.ref_quad for t in self.trackers]
+
+    def _build_index(self) -> None:
+        self.matcher.clear()
+        self._indexed = [i for i, t in enumerate(self.trackers) if t.marker_des is not None and len(t.marker_des) >= 2]
+        if self._indexed:
+            self.matcher.add([self.trackers[i].marker_des for i in self._indexed])
+            self.matcher.train()
+
+    def match(self, frame_bgr: np.ndarray, visualize: bool = False) -> List[HomographyResult]:
+        """One ``HomographyResult`` per marker, in registration order."""
+        gray = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY) if frame_bgr.ndim == 3 else frame_bgr
+        results: List[HomographyResult | None] = [None] * len(self.trackers)
+        for i, tracker in enumerate(self.trackers):
+            if tracker.tracking and tracker.is_locked:
+                results[i] = tracker._track(gray, frame_bgr, visualize)
+                if results[i] is None:
+                    tracker.reset_tracking()
+
+        pending = [i for i, r in enumerate(results) if r is None]
+        if pending:
+            per_marker = self._match_all(gray)
+            for i in pending:
+                found = None
+                if per_marker is not None:
+                    found = self.trackers[i]._fit(per_marker[0].get(i, []), per_marker[1])
+                results[i] = self.trackers[i]._accept(found, gray, frame_bgr, visualize)
+        return results
+
+    def _match_all(self, gray: np.ndarray):
+        """Frame keypoints and good matches grouped by marker, or None when nothing can match."""
+        if not self._indexed:
+            return None
+        with self.timer.stage("features"):
+            kp2, des2 = self.detector.detectAndCompute(gray, None)
+        if des2 is None or len(des2) < 2:
+            return None
+        with self.timer.stage("matching"):
+            good = ratio_test(self.matcher.knnMatch(des2, k=2), self.backend.ratio)
+        groups = {}
+        for m in good:
+            groups.setdefault(self._indexed[m.imgIdx], []).append(m)
+        return groups, kp2
+
 
 class AnalyseurSIFT:
-    def __init__(self, marker_gray: np.ndarray):
+    def __init__(self, marker_gray: np.ndarray, features: Features | None = None,
+                 cache_dir: Path | None = FEATURE_CACHE_DIR):
         self.marker_gray = marker_gray
-        self.sift = cv2.SIFT_create()
+        backend = FEATURE_BACKENDS["sift"]
+        self.sift = backend.create_detector()
+        if features is None:
+            cache = FeatureCache(cache_dir) if cache_dir is not None else None
+            features = compute_features(self.sift, marker_gray, backend.ident, cache)
+        self.kp1, self.des1 = features
 
     def detecter_correspondances(self, image_bgr: np.ndarray):
-        kp1, des1 = self.sift.detectAndCompute(self.marker_gray, None)
+        kp1, des1 = self.kp1, self.des1
         kp2, des2 = self.sift.detectAndCompute(image_bgr, None)
         if des1 is None or des2 is None:
             return [], kp1, kp2, des1
@@ -0,0 +1,147 @@
+
+from __future__ import annotations
+from typing import List
+import cv2
+import numpy as np
+from ..models.frame import FrameSet
+from ..models.geometry import AlignmentResult
+from ..models.metrics import coverage_and_angles, coverage_and_angles_batch, rect_to_quad_homography
+from .marker import MarkerTracker, MultiMarkerTracker
+
+
+class AlignmentPipeline:
+    """
+    Per-frame processing of the alignment screen.
+
+    The frame goes through a single feature extraction and match in the tracker;
+    the homography, marker quad, inliers, metrics and panels all derive from it.
+    The tilt reuses the tracker homography rather than fitting a new one.
+    """
+
+    def __init__(self, tracker: MarkerTracker, ref_quad: np.ndarray | None = None) -> None:
+        self.tracker = tracker
+        self.ref_quad = ref_quad
+
+    @property
+    def ref_quad(self) -> np.ndarray | None:
+        return self._ref_quad
+
+    @ref_quad.setter
+    def ref_quad(self, quad: np.ndarray | None) -> None:
+        self._ref_quad = quad
+        self._ref_from_marker = None
+        self.tracker.set_reference(quad)
+
+    def _marker_to_ref(self, H: np.ndarray | None) -> np.ndarray | None:
+        """Homography taking the detected marker quad (frame coordinates) onto the reference quad."""
+        if H is None or self.tracker.marker_gray is None:
+            return None
+        shape = self.tracker.marker_gray.shape
+        if self._ref_from_marker is None or self._ref_from_marker[0] != shape:
+            h, w = shape
+            self._ref_from_marker = (shape, rect_to_quad_homography(w, h, self.ref_quad))
+        try:
+            return self._ref_from_marker[1] @ np.linalg.inv(H)
+        except np.linalg.LinAlgError:
+            return None
+
+    def process(self, frame_bgr: np.ndarray, visualize: bool = True) -> AlignmentResult:
+        timer = self.tracker.timer
+        with timer.stage("match"):
+            result = self.tracker.match(frame_bgr, visualize=visualize)
+        out = AlignmentResult(result)
+
+        if self.ref_quad is not None and result.dst_quad is not None and len(result.dst_quad) == 4:
+            with timer.stage("metrics"):
+                out.overlap, out.angle_x, out.angle_y = coverage_and_angles(
+                    self.ref_quad, result.dst_quad.reshape(4, 2), self._marker_to_ref(result.H))
+
+        if visualize:
+            with timer.stage("overlay"):
+                out.matches_vis = result.matches_vis if result.matches_vis is not None else frame_bgr
+                found_marker = frame_bgr.copy()
+                if result.dst_quad is not None:
+                    cv2.polylines(found_marker, [np.int32(result.dst_quad)], True, (255, 0, 0), 3)
+                if self.ref_quad is not None:
+                    cv2.polylines(found_marker, [np.int32(self.ref_quad)], True, (0, 255, 0), 3)
+                out.estimation_vis = found_marker
+        return out
+
+
+class MultiAlignmentPipeline:
+    """
+    ``AlignmentPipeline`` for a ``MultiMarkerTracker``: one shared detection per
+    frame and the metrics of every marker computed in one batch. References
+    are the trackers' own (``MultiMarkerTracker.set_reference``).
+    """
+
+    def __init__(self, tracker: MultiMarkerTracker) -> None:
+        self.tracker = tracker
+
+    def process(self, frame_bgr: np.ndarray, visualize: bool = True) -> list:
+        with self.tracker.timer.stage("match"):
+            results = self.tracker.match(frame_bgr, visualize=visualize)
+        return self.measure(frame_bgr, results, visualize)
+
+    def measure(self, frame_bgr: np.ndarray, results: list, visualize: bool = True) -> list:
+        """Metrics and panels of ``MultiMarkerTracker.match`` results, against the current references."""
+        timer = self.tracker.timer
+        outs = [AlignmentResult(r) for r in results]
+
+        ready = [i for i, (t, r) in enumerate(zip(self.tracker.trackers, results))
+                 if t.ref_quad is not None and r.dst_quad is not None and r.H is not None]
+        if ready:
+            with timer.stage("metrics"):
+                refs = np.stack([self.tracker.trackers[i].ref_quad for i in ready])
+                quads = np.stack([results[i].dst_quad.reshape(4, 2) for i in ready])
+                H = np.empty((len(ready), 3, 3))
+                for k, i in enumerate(ready):
+                    h, w = self.tracker.trackers[i].marker_gray.shape
+                    try:
+                        H[k] = rect_to_quad_homography(w, h, refs[k]) @ np.linalg.inv(results[i].H)
+                    except np.linalg.LinAlgError:
+                        H[k] = np.nan  # degenerate: no tilt for this marker
+                overlap, angle_x, angle_y = coverage_and_angles_batch(refs, quads, H)
+            for k, i in enumerate(ready):
+                outs[i].overlap, outs[i].angle_x, outs[i].angle_y = (
+                    None if not np.isfinite(v) else float(v) for v in (overlap[k], angle_x[k], angle_y[k])
+                )
+
+        if visualize:
+            with timer.stage("overlay"):
+                found_marker = frame_bgr.copy()
+                for t, r in zip(self.tracker.trackers, results):
+                    if r.dst_quad is not None:
+                        cv2.polylines(found_marker, [np.int32(r.dst_quad)], True, (255, 0, 0), 3)
+                    if t.ref_quad is not None:
+                        cv2.polylines(found_marker, [np.int32(t.ref_quad)], True, (0, 255, 0), 3)
+                for out, r in zip(outs, results):
+                    out.matches_vis = r.matches_vis if r.matches_vis is not None else frame_bgr
+                    out.estimation_vis = found_marker
+        return outs
+
+
+class FrameSetPipeline:
+    """
+    Alignment of every camera of a ``CapturePool``: one ``AlignmentPipeline``
+    per camera, each with its own reference quad, fed with the frames of one
+    ``FrameSet`` at a time. The marker features are extracted once and shared.
+    """
+
+    def __init__(self, pipelines: List[AlignmentPipeline]) -> None:
+        self.pipelines = pipelines
+
+    def load_marker(self, image: np.ndarray, features=None) -> None:
+        first = self.pipelines[0].tracker
+        first.load_marker(image, features)
+        for pipeline in self.pipelines[1:]:
+            pipeline.tracker.load_marker(first.marker_gray, first.marker_features)
+
+    def set_references(self, quads: List[np.ndarray | None]) -> None:
+        for pipeline, quad in zip(self.pipelines, quads):
+            pipeline.ref_quad = quad
+
+    def process(self, frame_set: FrameSet, visualize: bool = True) -> List[AlignmentResult]:
+        """One result per camera; only the first camera's panels are drawn."""
+        return [pipeline.process(image, visualize=visualize and i == 0)
+                for i, (pipeline, image) in enumerate(zip(self.pipelines, frame_set.images))]
@@ -0,0 +1,168 @@
+
+from __future__ import annotations
+import queue
+import threading
+import time
+from typing import Any, Callable, NamedTuple, Optional
+import cv2
+import numpy as np
+
+
+class DecodedFrame(NamedTuple):
+    index: int
+    pts: float      # seconds since the start of playback, growing across loops
+    image: np.ndarray
+
+
+class VideoDecoder:
+    """
+    Decodes a video file on its own thread into a bounded prefetch queue.
+
+    The video loops: at the end the decoder seeks back to frame 0 by itself, so
+    the rewind is hidden behind the frames already queued. Timestamps keep
+    increasing across loops.
+    """
+
+    def __init__(self, path: str, prefetch: int = 8) -> None:
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise IOError(f"Unable to read the video {path}")
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.fps = fps if fps and fps > 0 else 30.0
+        self._queue: "queue.Queue[DecodedFrame]" = queue.Queue(maxsize=max(1, prefetch))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="decode", daemon=True)
+        self.decoded = 0
+        self.loops = 0
+
+    def start(self) -> "VideoDecoder":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        empty_loop = True
+        while not self._stop.is_set():
+            ok, frame = self.cap.read()
+            if not ok:
+                if empty_loop:
+                    print(f"No frame could be decoded from {self.path}")
+                    break
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                self.loops += 1
+                empty_loop = True
+                continue
+            empty_loop = False
+            packet = DecodedFrame(self.decoded, self.decoded / self.fps, frame)
+            self.decoded += 1
+            while not self._stop.is_set():
+                try:
+                    self._queue.put(packet, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def get(self, timeout: float | None = None) -> Optional[DecodedFrame]:
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=2.0)
+        self.cap.release()
+
+
+class OutputStage:
+    """
+    Runs ``fn(frame)`` for an output on its own thread.
+
+    Holds a single pending frame: offering a new one while the previous is
+    still waiting replaces it and counts a drop, so a slow output never delays
+    the others.
+    """
+
+    def __init__(self, name: str, fn: Callable[[Any], None]) -> None:
+        self.name = name
+        self.fn = fn
+        self._pending: Any = None
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.sent = 0
+        self.dropped = 0
+
+    def start(self) -> "OutputStage":
+        self._thread.start()
+        return self
+
+    def offer(self, frame: Any) -> None:
+        with self._cond:
+            if self._pending is not None:
+                self.dropped += 1
+            self._pending = frame
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stop:
+                    self._cond.wait()
+                if self._stop:
+                    return
+                frame, self._pending = self._pending, None
+            try:
+                self.fn(frame)
+                self.sent += 1
+            except Exception as e:
+                print(f"{self.name} output error: {e}")
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        self._thread.join(timeout=2.0)
+
+
+class FramePacer:
+    """
+    Presents frames at ``start + pts`` on the monotonic clock.
+
+    Unlike a fixed delay per frame, processing time does not accumulate into
+    drift. Frames more than ``max_late`` seconds behind their slot should be
+    dropped; the others are shown and counted as late when past their slot.
+    A drop moves the clock to the dropped frame, so a decoder slower than real
+    time plays slower with the odd drop instead of dropping every frame.
+    """
+
+    def __init__(self, fps: float, max_late: float | None = None, tolerance: float = 0.002) -> None:
+        self.period = 1.0 / fps
+        self.max_late = self.period if max_late is None else max_late
+        self.tolerance = tolerance
+        self.start: float | None = None
+        self.shown = 0
+        self.late = 0
+        self.dropped = 0
+
+    def wait(self, pts: float) -> bool:
+        """Sleep until the slot of ``pts``. Returns False when the frame is too late and should be skipped."""
+        now = time.monotonic()
+        if self.start is None:
+            self.start = now - pts
+        lateness = now - (self.start + pts)
+        if lateness > self.max_late:
+            self.dropped += 1
+            self.start = now - pts
+            return False
+        if lateness < 0:
+            time.sleep(-lateness)
+        elif lateness > self.tolerance:
+            self.late += 1
+        self.shown += 1
+        return True
@@ -2,34 +2,87 @@
 from __future__ import annotations
 import cv2
 import numpy as np
-from typing import Tuple
+from typing import List, Tuple
 from PIL import Image
-from ..models import HsvThresholds
+from ..models import HsvThresholds, BorderDetection
 
 K5 = np.ones((5, 5), np.uint8)
 
-def compute_hsv_mask(bgr: np.ndarray, h: Tuple[int, int], s: Tuple[int, int], v: Tuple[int, int]) -> np.ndarray:
-    hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+def _bounds(h: Tuple[int, int], s: Tuple[int, int], v: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
     lower = np.array([h[0], s[0], v[0]], dtype=np.uint8)
     upper = np.array([h[1], s[1], v[1]], dtype=np.uint8)
+    return lower, upper
+
+def mask_from_hsv(hsv: np.ndarray, h: Tuple[int, int], s: Tuple[int, int], v: Tuple[int, int]) -> np.ndarray:
+    lower, upper = _bounds(h, s, v)
     mask = cv2.inRange(hsv, lower, upper)
     return cv2.morphologyEx(mask, cv2.MORPH_CLOSE, K5)
 
-def biggest_inner_quad(mask: np.ndarray) -> np.ndarray | None:
+def compute_hsv_mask(bgr: np.ndarray, h: Tuple[int, int], s: Tuple[int, int], v: Tuple[int, int]) -> np.ndarray:
+    return mask_from_hsv(cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV), h, s, v)
+
+def inner_quads(mask: np.ndarray, limit: int) -> List[np.ndarray]:
+    """The ``limit`` largest inner quads of ``mask`` (one per display on a wall), largest first."""
     contours, hierarchy = cv2.findContours(mask, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
-    best_inner, max_area = None, 0.0
     if hierarchy is None:
-        return None
+        return []
+    found = []
     for i, h in enumerate(hierarchy[0]):
         if h[3] != -1:
-            cnt = contours[i]
-            epsilon = 0.02 * cv2.arcLength(cnt, True)
-            approx = cv2.approxPolyDP(cnt, epsilon, True)
+            approx = cv2.approxPolyDP(contours[i], 0.02 * cv2.arcLength(contours[i], True), True)
             if len(approx) == 4:
-                area = cv2.contourArea(approx)
-                if area > max_area:
-                    best_inner, max_area = approx, area
-    return best_inner
+                found.append((cv2.contourArea(approx), approx))
+    found.sort(key=lambda item: item[0], reverse=True)
+    return [quad for area, quad in found[:limit] if area > 0]
+
+def biggest_inner_quad(mask: np.ndarray) -> np.ndarray | None:
+    quads = inner_quads(mask, 1)
+    return quads[0] if quads else None
+
+
+class HsvPreprocessor:
+    """
+    BGR frame -> HSV mask -> biggest inner quad, without leaving NumPy.
+
+    The HSV image, masks and annotated frame are written into buffers kept
+    between calls, so the returned arrays are only valid until the next call.
+    Calls passing the same ``frame_key`` as the previous one reuse its HSV
+    conversion: only the thresholding and contours are redone.
+    """
+
+    def __init__(self) -> None:
+        self._shape: Tuple[int, ...] | None = None
+        self._hsv = self._raw_mask = self._mask = self._annotated = None
+        self._hsv_key = None
+
+    def _ensure_buffers(self, shape: Tuple[int, ...]) -> None:
+        if shape == self._shape:
+            return
+        self._shape = shape
+        self._hsv_key = None
+        self._hsv = np.empty(shape, np.uint8)
+        self._raw_mask = np.empty(shape[:2], np.uint8)
+        self._mask = np.empty(shape[:2], np.uint8)
+        self._annotated = np.empty(shape, np.uint8)
+
+    def process(self, bgr: np.ndarray, thresholds: HsvThresholds, annotate: bool = True,
+                frame_key: object = None) -> BorderDetection:
+        self._ensure_buffers(bgr.shape)
+        if frame_key is None or frame_key != self._hsv_key:
+            cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV, dst=self._hsv)
+            self._hsv_key = frame_key
+        lower, upper = _bounds(thresholds.h, thresholds.s, thresholds.v)
+        cv2.inRange(self._hsv, lower, upper, dst=self._raw_mask)
+        cv2.morphologyEx(self._raw_mask, cv2.MORPH_CLOSE, K5, dst=self._mask)
+        quad = biggest_inner_quad(self._mask)
+
+        annotated = None
+        if annotate:
+            annotated = self._annotated
+            np.copyto(annotated, bgr)
+            if quad is not None:
+                cv2.polylines(annotated, [np.int32(quad)], True, (0, 255, 0), 2)
+        return BorderDetection(self._mask, quad, annotated)
 
 
 class ControleurImage:
@@ -37,43 +90,21 @@ class ControleurImage:
         self.slider_h = slider_h
         self.slider_s = slider_s
         self.slider_v = slider_v
+        self.preprocessor = HsvPreprocessor()
+
+    def thresholds(self) -> HsvThresholds:
+        h, s, v = (tuple(int(x) for x in sl.getValues()) for sl in (self.slider_h, self.slider_s, self.slider_v))
+        return HsvThresholds(h, s, v)
+
+    def traiter_bgr(self, bgr: np.ndarray, thresholds: "HsvThresholds | None" = None,
+                    frame_key: object = None) -> BorderDetection:
+        return self.preprocessor.process(bgr, thresholds if thresholds is not None else self.thresholds(),
+                                         frame_key=frame_key)
 
     def traiter_image(self, image: Image.Image, thresholds: "HsvThresholds | None" = None):
+        """PIL entry point kept for callers outside the app; the app uses ``traiter_bgr``."""
         image_cv = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-        hsv = cv2.cvtColor(image_cv, cv2.COLOR_BGR2HSV)
-
-        if thresholds is None:
-            h_min, h_max = self.slider_h.getValues()
-            s_min, s_max = self.slider_s.getValues()
-            v_min, v_max = self.slider_v.getValues()
-        else:
-            h_min, h_max = thresholds.h
-            s_min, s_max = thresholds.s
-            v_min, v_max = thresholds.v
-
-        lower = np.array([h_min, s_min, v_min], dtype=np.uint8)
-        upper = np.array([h_max, s_max, v_max], dtype=np.uint8)
-        mask = cv2.inRange(hsv, lower, upper)
-        mask_clean = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, K5)
-
-        contours, hierarchy = cv2.findContours(mask_clean, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
-        best_inner = None
-        max_area = 0.0
-        if hierarchy is not None:
-            for i, h in enumerate(hierarchy[0]):
-                if h[3] != -1:
-                    cnt = contours[i]
-                    epsilon = 0.02 * cv2.arcLength(cnt, True)
-                    approx = cv2.approxPolyDP(cnt, epsilon, True)
-                    if len(approx) == 4:
-                        area = cv2.contourArea(approx)
-                        if area > max_area:
-                            best_inner, max_area = approx, area
-
-        annotated = image_cv.copy()
-        if best_inner is not None:
-            cv2.polylines(annotated, [np.int32(best_inner)], True, (0, 255, 0), 2)
-
-        pil_mask = Image.fromarray(mask_clean).convert("RGB")
-        pil_annotated = Image.fromarray(cv2.cvtColor(annotated, cv2.COLOR_BGR2RGB))
+        result = self.traiter_bgr(image_cv, thresholds)
+        pil_mask = Image.fromarray(result.mask).convert("RGB")
+        pil_annotated = Image.fromarray(cv2.cvtColor(result.annotated, cv2.COLOR_BGR2RGB))
         return pil_mask, pil_annotated
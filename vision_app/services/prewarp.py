@@ -0,0 +1,66 @@
+
+from __future__ import annotations
+from typing import Dict, Tuple
+import cv2
+import numpy as np
+from ..models.metrics import rect_to_quad_homography
+from ..models.profile import CalibrationProfile
+
+Size = Tuple[int, int]
+
+
+class PreWarp:
+    """
+    Pre-distorts projector output so that it lands on the calibrated TV frame.
+
+    The calibration sees the marker, shown full screen on the projector, through
+    ``homography`` (marker image -> camera). Content must instead appear on
+    ``ref_quad``, so each output pixel samples the content at
+    ``inverse(rect -> ref_quad) @ homography``. That lookup, together with the
+    scaling between content, marker and output sizes, is baked once per
+    (content size, output size) into fixed-point ``cv2.remap`` maps.
+    """
+
+    def __init__(self, homography: np.ndarray, ref_quad: np.ndarray, marker_size: Size) -> None:
+        mw, mh = marker_size
+        self.marker_size = (mw, mh)
+        to_ref = rect_to_quad_homography(mw, mh, ref_quad)
+        self.projector_to_content = np.linalg.inv(to_ref) @ np.asarray(homography, dtype=np.float64)
+        self._maps: Dict[Tuple[Size, Size], Tuple[np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def from_profile(cls, profile: CalibrationProfile) -> "PreWarp":
+        if profile.homography is None or profile.ref_quad is None or profile.marker_size is None:
+            raise ValueError("The calibration profile has no marker homography yet")
+        return cls(profile.homography, profile.ref_quad, profile.marker_size)
+
+    def maps(self, src_size: Size, out_size: Size) -> Tuple[np.ndarray, np.ndarray]:
+        """Remap tables turning a ``src_size`` (w, h) image into the ``out_size`` pre-warped output."""
+        key = (tuple(src_size), tuple(out_size))
+        maps = self._maps.get(key)
+        if maps is None:
+            (sw, sh), (ow, oh) = key
+            mw, mh = self.marker_size
+            out_to_marker = np.diag([mw / ow, mh / oh, 1.0])
+            marker_to_src = np.diag([sw / mw, sh / mh, 1.0])
+            T = (marker_to_src @ self.projector_to_content @ out_to_marker).astype(np.float32)
+
+            xs = np.arange(ow, dtype=np.float32)[None, :]
+            ys = np.arange(oh, dtype=np.float32)[:, None]
+            w = T[2, 0] * xs + T[2, 1] * ys + T[2, 2]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                map_x = (T[0, 0] * xs + T[0, 1] * ys + T[0, 2]) / w
+                map_y = (T[1, 0] * xs + T[1, 1] * ys + T[1, 2]) / w
+            # Points behind the projection centre or out of range sample the black border.
+            outside = ~(w > 0) | ~np.isfinite(map_x) | ~np.isfinite(map_y)
+            map_x[outside] = -1
+            map_y[outside] = -1
+            np.clip(map_x, -1, sw, out=map_x)
+            np.clip(map_y, -1, sh, out=map_y)
+            maps = self._maps[key] = cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
+        return maps
+
+    def apply(self, src: np.ndarray, out_size: Size, dst: np.ndarray | None = None) -> np.ndarray:
+        """One ``cv2.remap`` of ``src`` into the pre-warped ``out_size`` image (written to ``dst`` if given)."""
+        map1, map2 = self.maps((src.shape[1], src.shape[0]), out_size)
+        return cv2.remap(src, map1, map2, cv2.INTER_LINEAR, dst=dst, borderMode=cv2.BORDER_CONSTANT, borderValue=0)
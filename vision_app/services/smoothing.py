@@ -0,0 +1,112 @@
+
+from __future__ import annotations
+import math
+import time
+from typing import Optional
+import numpy as np
+
+
+class QuadFilter:
+    """
+    Temporal filter of a (4, 2) marker quad, updated in constant time per frame.
+
+    ``confidence`` in [0, 1] tells how much the new measurement can be trusted.
+    ``reset`` forgets the past, e.g. after the marker was lost.
+    """
+
+    def update(self, quad: np.ndarray, confidence: float = 1.0, t: Optional[float] = None) -> np.ndarray:
+        return quad
+
+    def reset(self) -> None:
+        pass
+
+
+class MovingAverageFilter(QuadFilter):
+    """Mean of the last ``length`` quads, kept as a running sum."""
+
+    def __init__(self, length: int = 10) -> None:
+        self.length = max(1, length)
+        self.reset()
+
+    def reset(self) -> None:
+        self._ring = np.zeros((self.length, 4, 2))
+        self._sum = np.zeros((4, 2))
+        self._count = 0
+        self._pos = 0
+
+    def update(self, quad: np.ndarray, confidence: float = 1.0, t: Optional[float] = None) -> np.ndarray:
+        quad = np.asarray(quad, dtype=np.float64).reshape(4, 2)
+        self._sum += quad - self._ring[self._pos]
+        self._ring[self._pos] = quad
+        self._pos = (self._pos + 1) % self.length
+        self._count = min(self._count + 1, self.length)
+        return (self._sum / self._count).astype(np.float32)
+
+
+class OneEuroQuadFilter(QuadFilter):
+    """
+    One-euro filter on the 8 corner coordinates.
+
+    The cutoff rises with the corner speed: a still marker is smoothed hard,
+    a moving one follows with little lag. The smoothing factor is scaled by
+    ``confidence``, so weak estimates move the output less. A measurement whose
+    corners jump further than ``outlier_ratio`` of the quad diagonal is
+    ignored, up to ``max_outliers`` in a row; after that it is taken as a real
+    move and the filter restarts from it.
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 0.05, d_cutoff: float = 1.0,
+                 outlier_ratio: float = 0.25, max_outliers: int = 3) -> None:
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.outlier_ratio = outlier_ratio
+        self.max_outliers = max_outliers
+        self.reset()
+
+    def reset(self) -> None:
+        self._x: Optional[np.ndarray] = None
+        self._dx = np.zeros((4, 2))
+        self._t: Optional[float] = None
+        self._outliers = 0
+
+    @staticmethod
+    def _alpha(cutoff, dt: float):
+        tau = 1.0 / (2.0 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def update(self, quad: np.ndarray, confidence: float = 1.0, t: Optional[float] = None) -> np.ndarray:
+        quad = np.asarray(quad, dtype=np.float64).reshape(4, 2)
+        t = time.monotonic() if t is None else t
+        if self._x is None:
+            self._x, self._t = quad, t
+            return quad.astype(np.float32)
+
+        diagonal = float(np.linalg.norm(self._x[2] - self._x[0]))
+        if np.abs(quad - self._x).max() > self.outlier_ratio * diagonal:
+            self._outliers += 1
+            if self._outliers <= self.max_outliers:
+                return self._x.astype(np.float32)
+            self.reset()
+            return self.update(quad, confidence, t)
+        self._outliers = 0
+
+        dt = max(t - self._t, 1e-3)
+        self._t = t
+        weight = min(max(confidence, 0.0), 1.0)
+        dx = (quad - self._x) / dt
+        self._dx += self._alpha(self.d_cutoff, dt) * (dx - self._dx)
+        cutoff = self.min_cutoff + self.beta * np.abs(self._dx)
+        self._x = self._x + weight * self._alpha(cutoff, dt) * (quad - self._x)
+        return self._x.astype(np.float32)
+
+
+def make_quad_filter(kind: Optional[str], history_len: int = 10) -> QuadFilter:
+    """``"one_euro"``, ``"mean"`` (over ``history_len`` frames) or None for no smoothing."""
+    if kind is None or kind == "none":
+        return QuadFilter()
+    if kind == "mean":
+        return MovingAverageFilter(history_len)
+    if kind == "one_euro":
+        return OneEuroQuadFilter()
+    raise ValueError(f"Unknown quad filter {kind!r}")
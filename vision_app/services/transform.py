@@ -0,0 +1,76 @@
+
+from __future__ import annotations
+from typing import Optional
+import cv2
+import numpy as np
+from .drawing import Size, fit_size, interpolation_for
+
+# Aspect ratios closer than this are stretched instead of letterboxed.
+ASPECT_TOLERANCE = 0.01
+
+
+class FrameTransform:
+    """
+    Mirror, aspect-fit and letterbox of an output, applied in one pass.
+
+    The geometry is planned once per input shape; every frame is then written
+    into the same preallocated buffer. With ``pad`` the result is always
+    ``size`` with the content centred on black, otherwise it is the fitted
+    size itself. ``apply`` returns that buffer: it is overwritten by the next
+    call, so consumers on other threads must copy it.
+    """
+
+    def __init__(self, size: Size, mirror: bool = False, keep_aspect: bool = True, pad: bool = False) -> None:
+        self.size = (int(size[0]), int(size[1]))
+        self.mirror = mirror
+        self.keep_aspect = keep_aspect
+        self.pad = pad
+        self._key: Optional[tuple] = None
+        self._buffer: Optional[np.ndarray] = None
+        self._roi: Optional[np.ndarray] = None
+        self._matrix: Optional[np.ndarray] = None
+        self._interpolation = cv2.INTER_LINEAR
+
+    def content_size(self, src_size: Size) -> Size:
+        sw, sh = src_size
+        w, h = self.size
+        if self.keep_aspect and abs(sw / sh - w / h) > ASPECT_TOLERANCE:
+            return fit_size((sw, sh), (w, h))
+        return w, h
+
+    def _plan(self, src: np.ndarray) -> None:
+        sh, sw = src.shape[:2]
+        cw, ch = self.content_size((sw, sh))
+        if self.pad:
+            (ow, oh), (ox, oy) = self.size, ((self.size[0] - cw) // 2, (self.size[1] - ch) // 2)
+        else:
+            (ow, oh), (ox, oy) = (cw, ch), (0, 0)
+
+        self._buffer = np.zeros((oh, ow) + src.shape[2:], src.dtype)
+        self._roi = self._buffer[oy:oy + ch, ox:ox + cw]
+        scale = min(cw / sw, ch / sh)
+        self._interpolation = interpolation_for(scale)
+
+        # Pixel-centre mapping src -> dst, mirrored around the content box when asked.
+        sx, sy = cw / sw, ch / sh
+        if self.mirror:
+            row_x = [-sx, 0.0, ox + cw - 0.5 - 0.5 * sx]
+        else:
+            row_x = [sx, 0.0, ox + 0.5 * sx - 0.5]
+        row_y = [0.0, sy, oy + 0.5 * sy - 0.5]
+        self._matrix = np.array([row_x, row_y], dtype=np.float64)
+        self._key = src.shape + (src.dtype,)
+
+    def apply(self, src: np.ndarray) -> np.ndarray:
+        if self._key != src.shape + (src.dtype,):
+            self._plan(src)
+        if self._interpolation == cv2.INTER_AREA:
+            # Strong downscale: warpAffine would alias, area resize straight into the buffer instead.
+            cv2.resize(src, (self._roi.shape[1], self._roi.shape[0]), dst=self._roi, interpolation=cv2.INTER_AREA)
+            if self.mirror:
+                cv2.flip(self._roi, 1, dst=self._roi)
+        else:
+            oh, ow = self._buffer.shape[:2]
+            cv2.warpAffine(src, self._matrix, (ow, oh), dst=self._buffer, flags=self._interpolation,
+                           borderMode=cv2.BORDER_CONSTANT, borderValue=0)
+        return self._buffer
@@ -1,15 +1,163 @@
 
 from __future__ import annotations
+import json
+import os
+import threading
+import time
 import cv2
-from typing import Tuple, Iterable, Optional
-from ..config import FFMPEG_DIR, CAM_DEVICE_NAME, PREFERRED_BACKENDS
+from collections import deque
+from pathlib import Path
+from typing import Deque, List, Tuple, Iterable, Optional
+from ..config import (
+    FFMPEG_DIR, CAM_DEVICE_NAME, PREFERRED_BACKENDS, CAPTURE_BUFFER_SIZE,
+    CAM_OPEN_TIMEOUT, CAM_FOURCC, CAM_RESOLUTION, CAM_FPS, CAMERA_CACHE,
+)
+from ..models.frame import CapturedFrame
 from ..utils.system import add_ffmpeg_dir
 
+# Smoothing factor of the fps / grab time averages.
+STATS_EMA = 0.1
+
+Attempt = Tuple[object, int]  # (source, cv2.CAP_* backend)
+
+
+def _open(source, api: int):
+    cap = cv2.VideoCapture(source, api)
+    if cap is not None and cap.isOpened():
+        return cap
+    if cap is not None:
+        cap.release()
+    return None
+
+
+def probe_backends(attempts: List[Attempt], timeout: float = CAM_OPEN_TIMEOUT):
+    """
+    Try the (source, backend) attempts one at a time, in order, and return
+    ``(cap, attempt, clean)`` for the first that opens, or ``(None, None, clean)``.
+
+    Attempts usually name the same physical camera and most drivers allow a
+    single open handle, so they are never run side by side. Each gets its own
+    thread and ``timeout`` seconds; one still blocked by then counts as failed
+    and its capture is released if it opens later. ``clean`` is False when an
+    attempt timed out: the result may then only reflect a busy device and
+    should not be remembered.
+    """
+    clean = True
+    for source, api in attempts:
+        done = threading.Event()
+        lock = threading.Lock()
+        box: list = []
+
+        def run(source=source, api=api, done=done, lock=lock, box=box) -> None:
+            cap = _open(source, api)
+            with lock:
+                if not done.is_set():
+                    box.append(cap)
+                    done.set()
+                    return
+            if cap is not None:
+                cap.release()
+
+        threading.Thread(target=run, name=f"probe-{api}", daemon=True).start()
+        done.wait(timeout)
+        with lock:
+            if not done.is_set():
+                # Timed out: the thread releases whatever it opens later.
+                done.set()
+                clean = False
+                continue
+        cap = box[0]
+        if cap is not None:
+            return cap, (source, api), clean
+    return None, None, clean
+
+
+class CameraCache:
+    """
+    Last working source, backend and format per camera, as JSON.
+
+    Cameras of a pool open concurrently: reads and read-modify-writes share
+    one lock, and each write goes through its own temporary file.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, path: Path = CAMERA_CACHE) -> None:
+        self.path = Path(path)
+
+    def _read(self) -> dict:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            return self._read().get(key)
+
+    def put(self, key: str, entry: dict) -> None:
+        with self._lock:
+            try:
+                data = self._read()
+                data[key] = entry
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+                os.replace(tmp, self.path)
+            except Exception as e:
+                print(f"Unable to update camera cache {self.path}: {e}")
+
+
+def negotiate_format(cap, fourcc: Optional[str] = CAM_FOURCC, resolution: Optional[Tuple[int, int]] = CAM_RESOLUTION,
+                     fps: Optional[float] = CAM_FPS) -> dict:
+    """Request the capture format (FOURCC first, as DirectShow requires) and return what the driver granted."""
+    if fourcc:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+    if resolution:
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, resolution[0])
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, resolution[1])
+    if fps:
+        cap.set(cv2.CAP_PROP_FPS, fps)
+    code = int(cap.get(cv2.CAP_PROP_FOURCC))
+    return {
+        "fourcc": "".join(chr((code >> (8 * k)) & 0xFF) for k in range(4)) if code > 0 else None,
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "fps": float(cap.get(cv2.CAP_PROP_FPS)),
+    }
+
 class VideoCaptureService:
-    def __init__(self, index: int, backends: Iterable[int] = PREFERRED_BACKENDS, device_name: Optional[str] = CAM_DEVICE_NAME) -> None:
+    """
+    Camera wrapper.
+
+    In threaded mode a background thread grabs continuously into a small ring
+    buffer and reads return the newest frame without blocking. Frames that were
+    grabbed but never read are counted as dropped, frames returned more than
+    once as duplicates.
+    """
+
+    def __init__(self, index: int, backends: Iterable[int] = PREFERRED_BACKENDS, device_name: Optional[str] = CAM_DEVICE_NAME,
+                 threaded: bool = False, buffer_size: int = CAPTURE_BUFFER_SIZE,
+                 cache: CameraCache | None = CameraCache(), open_timeout: float = CAM_OPEN_TIMEOUT) -> None:
         add_ffmpeg_dir(FFMPEG_DIR)
         self.cap = None
         self._ok = False
+        self.source = None
+        self.api = -1
+        self.format: dict = {}
+
+        self._cap_lock = threading.Lock()
+        self._buffer_lock = threading.Lock()
+        self._buffer: Deque[CapturedFrame] = deque(maxlen=max(1, buffer_size))
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._seq = 0
+        self._last_read_seq = 0
+        self.frames_grabbed = 0
+        self.frames_dropped = 0
+        self.frames_duplicated = 0
+        self.fps = 0.0
+        self.grab_ms = 0.0
 
         tries = []
         if device_name:
@@ -18,33 +166,146 @@ class VideoCaptureService:
         for api in backends:
             tries.append((index, api))
 
-        for source, api in tries:
-            cap = cv2.VideoCapture(source, api)
-            if cap is not None and cap.isOpened():
-                self.cap = cap
-                self._ok = True
-                break
-            if cap is not None:
-                cap.release()
+        # Files and URLs open directly; cameras go through the cache, then a probe
+        # of the backends in preference order.
+        is_camera = isinstance(index, int)
+        key = f"{index}|{device_name or ''}"
+        cached = cache.get(key) if cache is not None and is_camera else None
+        cap, attempt, clean = None, None, True
+        if cached is not None:
+            cap, attempt, _ = probe_backends([(cached["source"], int(cached["api"]))], open_timeout)
+        if cap is None:
+            if is_camera:
+                cap, attempt, clean = probe_backends(tries, open_timeout)
+            else:
+                for source, api in tries:
+                    cap = _open(source, api)
+                    if cap is not None:
+                        attempt = (source, api)
+                        break
+
+        if cap is not None:
+            self.cap = cap
+            self._ok = True
+            self.source, self.api = attempt
+            if is_camera:
+                self.format = negotiate_format(cap)
+                if cache is not None and clean:
+                    cache.put(key, {"source": self.source, "api": self.api, **self.format})
+
+        if threaded:
+            self.start()
 
     @property
     def is_opened(self) -> bool:
         return bool(self._ok and self.cap is not None and self.cap.isOpened())
 
+    @property
+    def threaded(self) -> bool:
+        return self._thread is not None
+
     def configure_manual_exposure(self, auto: float, exposure: float) -> None:
         if not self.is_opened: return
-        self.cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, float(auto))
-        self.cap.set(cv2.CAP_PROP_EXPOSURE, float(exposure))
+        with self._cap_lock:
+            self.cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, float(auto))
+            self.cap.set(cv2.CAP_PROP_EXPOSURE, float(exposure))
 
     def set_exposure(self, exposure: float) -> None:
         if self.is_opened:
-            self.cap.set(cv2.CAP_PROP_EXPOSURE, float(exposure))
+            with self._cap_lock:
+                self.cap.set(cv2.CAP_PROP_EXPOSURE, float(exposure))
 
-    def read(self) -> Tuple[bool, object]:
+    # ---------- threaded grabbing ----------
+    def start(self) -> None:
+        if self._thread is not None or not self.is_opened:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._grab_loop, name="capture", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=2.0)
+        self._thread = None
+
+    def _grab(self) -> CapturedFrame | None:
+        start = time.monotonic()
+        with self._cap_lock:
+            ok, frame = self.cap.read()
+        if not ok or frame is None:
+            return None
+        timestamp = time.monotonic()
+        with self._buffer_lock:
+            if self._buffer:
+                interval = timestamp - self._buffer[-1].timestamp
+                if interval > 0:
+                    self.fps += STATS_EMA * (1.0 / interval - self.fps)
+            self.grab_ms += STATS_EMA * ((timestamp - start) * 1000.0 - self.grab_ms)
+            self._seq += 1
+            packet = CapturedFrame(frame, timestamp, self._seq)
+            self._buffer.append(packet)
+            self.frames_grabbed += 1
+        return packet
+
+    def _grab_loop(self) -> None:
+        while not self._stop.is_set():
+            if self._grab() is None:
+                time.sleep(0.005)
+
+    def read_latest(self) -> CapturedFrame | None:
+        """
+        Return the newest frame. Never blocks in threaded mode (None until the
+        first frame arrives); grabs synchronously otherwise.
+        """
         if not self.is_opened:
+            return None
+        if self._thread is None:
+            packet = self._grab()
+        else:
+            with self._buffer_lock:
+                packet = self._buffer[-1] if self._buffer else None
+        if packet is None:
+            return None
+        with self._buffer_lock:
+            if packet.seq == self._last_read_seq:
+                self.frames_duplicated += 1
+            else:
+                self.frames_dropped += max(0, packet.seq - self._last_read_seq - 1)
+                self._last_read_seq = packet.seq
+        return packet
+
+    def closest(self, timestamp: float) -> CapturedFrame | None:
+        """The buffered frame grabbed nearest to ``timestamp`` (threaded mode)."""
+        with self._buffer_lock:
+            if not self._buffer:
+                return None
+            return min(self._buffer, key=lambda p: abs(p.timestamp - timestamp))
+
+    def newest(self) -> CapturedFrame | None:
+        """The newest buffered frame, without touching the read counters."""
+        with self._buffer_lock:
+            return self._buffer[-1] if self._buffer else None
+
+    def stats(self) -> dict:
+        with self._buffer_lock:
+            return {
+                "grabbed": self.frames_grabbed,
+                "dropped": self.frames_dropped,
+                "duplicated": self.frames_duplicated,
+                "fps": self.fps,
+                "grab_ms": self.grab_ms,
+            }
+
+    def read(self) -> Tuple[bool, object]:
+        packet = self.read_latest()
+        if packet is None:
             return False, None
-        return self.cap.read()
+        return True, packet.image
 
     def release(self) -> None:
+        self.stop()
         if self.cap:
-            self.cap.release()
+            with self._cap_lock:
+                self.cap.release()
@@ -1,34 +1,51 @@
 from __future__ import annotations
+import threading
+import time
 import tkinter as tk
+from collections import deque
 from tkinter import ttk
 import cv2
 import numpy as np
-from PIL import Image
 
 from ..config import (
-    APP_TITLE, CAM_INDEX, AUTO_EXPO, EXPO_DEFAULT, EXPO_MIN, EXPO_MAX,
-    HSV_DEFAULTS, FRAME_DELAY_MS, MATCH_DELAY_MS, MARKER_IMAGE, FALLBACK_IMAGE, HISTORY_LEN,
-    TKSLIDER_DIR,
+    APP_TITLE, CAM_INDEX, PREFERRED_BACKENDS, AUTO_EXPO, EXPO_DEFAULT, EXPO_MIN, EXPO_MAX,
+    HSV_DEFAULTS, FRAME_DELAY_MS, MATCH_DELAY_MS, POLL_DELAY_MS, MARKER_IMAGE, FALLBACK_IMAGE, HISTORY_LEN,
+    TKSLIDER_DIR, CAPTURE_THREADED, TIMING_ENABLED, TIMING_WINDOW, TIMING_DUMP, PROFILE_PATH, AUTOTUNE_FRAMES,
 )
+from ..models import CalibrationProfile, HsvThresholds
 from ..utils.system import ensure_tkslider_on_path
+from ..utils.timing import StageTimer
 ensure_tkslider_on_path(TKSLIDER_DIR)
 
-from .widgets import RangeSlider, SingleSlider
-try:
-    from tkSliderWidget.tkSliderWidget import Slider as ThirdPartySlider 
-except Exception:
-    ThirdPartySlider = None
+from .widgets import RangeSlider, SingleSlider, third_party_slider
 
 from ..services.video import VideoCaptureService
-from ..services.preprocessing import compute_hsv_mask, biggest_inner_quad, ControleurImage
-from ..services.marker import MarkerTracker, AnalyseurSIFT
-from ..services.drawing import pil_from_bgr, draw_quad, GestionAffichage
-from ..models.metrics import coverage_and_angles
-from ..models import HsvThresholds
+from ..services.capture_pool import CapturePool
+from ..services.preprocessing import ControleurImage, HsvPreprocessor
+from ..services.autotune import auto_tune
+from ..services.executor import FrameExecutor
+from ..services.marker import MarkerTracker
+from ..services.pipeline import AlignmentPipeline, FrameSetPipeline
+from ..services.drawing import PanelRenderer
+from ..services.features import keypoints_from_array, keypoints_to_array
 
 
 class MainWindow:
-    def __init__(self) -> None:
+    def __init__(self, profile_path=PROFILE_PATH, resume: bool = False, camera: int | list = CAM_INDEX) -> None:
+        """
+        ``resume`` starts straight on the alignment screen from the profile at
+        ``profile_path``. A list of cameras opens them in a ``CapturePool``:
+        the thresholds are tuned on the first one and every camera is aligned
+        against its own reference frame.
+        """
+        self.cameras = list(camera) if isinstance(camera, (list, tuple)) else [camera]
+        self.camera = self.cameras[0]
+        self.profile_path = profile_path
+        if resume and len(self.cameras) > 1:
+            print("The profile holds a single camera: calibrating the cameras again.")
+            resume = False
+        profile = self._load_profile() if resume else None
+
         self.root = tk.Tk()
         self.root.title(APP_TITLE)
         try:
@@ -36,19 +53,88 @@ class MainWindow:
         except Exception:
             pass
 
-        self.cap = VideoCaptureService(CAM_INDEX)
-        self.cap.configure_manual_exposure(auto=AUTO_EXPO, exposure=EXPO_DEFAULT)
+        self.hsv_init = HSV_DEFAULTS
+        self.exposure = EXPO_DEFAULT
+        if profile is not None:
+            t = profile.thresholds
+            self.hsv_init = (t.h, t.s, t.v)
+            self.exposure = profile.exposure
+        # Opening a camera can take seconds: the window is built meanwhile and
+        # the loops skip capture until self.cap is set. A camera opened after
+        # the window closed is released by the opening thread itself.
+        self.cap = None
+        self.pool = None
+        self._camera_lock = threading.Lock()
+        self._closing = False
+        self._camera_fields = (self.camera, None, -1)
+        if profile is not None:
+            self._camera_fields = (profile.camera_index, profile.camera_device, profile.camera_backend)
+        self._camera_thread = threading.Thread(target=self._open_camera, args=(profile,), name="open-camera", daemon=True)
+        self._camera_thread.start()
 
         self.mode_columns = False
         self.ref_quad = None
+        self._last_H = None
         self.latest_frame = None
-        self.tracker = MarkerTracker(history_len=HISTORY_LEN)
+        self._last_seq = 0
+        self._next_submit = 0.0
+        self._hsv_pending = False
+        self._recent_frames = deque(maxlen=AUTOTUNE_FRAMES)
+        self._autotune_pending = False
+        self._read_error_reported = False
+        self.worker = FrameExecutor(max_workers=1)
+        self.timer = StageTimer(enabled=TIMING_ENABLED, window=TIMING_WINDOW)
+        self.tracker = MarkerTracker(history_len=HISTORY_LEN, timer=self.timer)
+        self.pipeline = AlignmentPipeline(self.tracker)
+        self.set_pipeline = None
+        self.ref_quads = []
+        self._profile_marker = None
 
         self.PANEL_W_2 = self.root.winfo_screenwidth() // 2
         self.PANEL_H_2 = self.root.winfo_screenheight() // 2
 
-        self._build_first_screen()
+        if profile is not None and profile.ref_quad is not None:
+            self.ref_quad = np.float32(profile.ref_quad)
+            if profile.marker_gray is not None:
+                self._profile_marker = profile
+            self._build_second_screen()
+        else:
+            self._build_first_screen()
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.root.bind("<F12>", lambda _e: self._dump_timings())
+
+    def _open_camera(self, profile: CalibrationProfile | None) -> None:
+        if len(self.cameras) > 1:
+            self._open_pool()
+            return
+        if profile is None:
+            cap = VideoCaptureService(self.camera, threaded=CAPTURE_THREADED)
+        else:
+            backends = [b for b in PREFERRED_BACKENDS if b != profile.camera_backend]
+            if profile.camera_backend >= 0:
+                backends.insert(0, profile.camera_backend)
+            cap = VideoCaptureService(profile.camera_index, backends, profile.camera_device, threaded=CAPTURE_THREADED)
+        if not cap.is_opened:
+            print("Unable to open the webcam.")
+        cap.configure_manual_exposure(auto=AUTO_EXPO, exposure=self.exposure)
+        with self._camera_lock:
+            if self._closing:
+                cap.release()
+                return
+            self.cap = cap
+
+    def _open_pool(self) -> None:
+        pool = CapturePool(self.cameras)
+        if not len(pool):
+            print("Unable to open the webcams.")
+        for cap in pool.cameras:
+            cap.configure_manual_exposure(auto=AUTO_EXPO, exposure=self.exposure)
+        with self._camera_lock:
+            if self._closing:
+                pool.release()
+                return
+            self.pool = pool
+            self.cap = pool.cameras[0] if len(pool) else None
 
     # ---------- SCREEN 1 ----------
     def _build_first_screen(self) -> None:
@@ -72,6 +158,9 @@ class MainWindow:
         self.label_3.place(x=0, y=0)
         self.label_4 = tk.Label(self.Frame4)
         self.label_4.place(x=0, y=0)
+        self.view_frame = PanelRenderer(self.label_1, frame=self.Frame1)
+        self.view_mask = PanelRenderer(self.label_3, frame=self.Frame3)
+        self.view_annotated = PanelRenderer(self.label_4, frame=self.Frame4)
 
         self._add_controls(self.Frame2)
         self._init_display_loop()
@@ -88,62 +177,72 @@ class MainWindow:
             frames.append(frame)
 
         # Hue
-        self.slider = RangeSlider(frames[0], "Hue", 0, 255, HSV_DEFAULTS[0], on_change=self._on_hsv_change)
+        self.slider = RangeSlider(frames[0], "Hue", 0, 255, self.hsv_init[0], on_change=self._on_hsv_change)
         self.slider.place(relx=0.1, rely=0.8, relwidth=0.8, anchor="w")
 
         # Saturation
-        self.slider2 = RangeSlider(frames[1], "Saturation", 0, 255, HSV_DEFAULTS[1], on_change=self._on_hsv_change)
+        self.slider2 = RangeSlider(frames[1], "Saturation", 0, 255, self.hsv_init[1], on_change=self._on_hsv_change)
         self.slider2.place(relx=0.1, rely=0.8, relwidth=0.8, anchor="w")
 
         # Value
-        self.slider3 = RangeSlider(frames[2], "Value / Luminance", 0, 255, HSV_DEFAULTS[2], on_change=self._on_hsv_change)
+        self.slider3 = RangeSlider(frames[2], "Value / Luminance", 0, 255, self.hsv_init[2], on_change=self._on_hsv_change)
         self.slider3.place(relx=0.1, rely=0.8, relwidth=0.8, anchor="w")
  
+        ThirdPartySlider = third_party_slider()
         if ThirdPartySlider is not None:
             self.slider_expo = ThirdPartySlider(
-                frames[3], height=40, min_val=EXPO_MIN, max_val=EXPO_MAX, init_lis=[EXPO_DEFAULT], show_value=True
+                frames[3], height=40, min_val=EXPO_MIN, max_val=EXPO_MAX, init_lis=[self.exposure], show_value=True
             )
             self.slider_expo.place(relx=0.1, rely=0.8, relwidth=0.8, anchor="w")
             ttk.Label(frames[3], text="Exposure").place(relx=0.5, rely=0.3, anchor="center")
             self.slider_expo.setValueChangeCallback(self._on_expo_change)
         else:
-            exo = SingleSlider(frames[3], "Exposure", EXPO_MIN, EXPO_MAX, EXPO_DEFAULT, on_change=self._on_expo_change)
+            exo = SingleSlider(frames[3], "Exposure", EXPO_MIN, EXPO_MAX, self.exposure, on_change=self._on_expo_change)
             exo.pack(fill="x", padx=24, pady=8)
             self.slider_expo = exo
 
+        auto_btn = ttk.Button(frames[4], text="Auto", command=self._request_autotune)
+        auto_btn.pack(pady=10)
+
         switch_btn = ttk.Button(frames[5], text="Next", command=lambda: [self._validate_cadre(), self._build_second_screen()])
         switch_btn.pack(pady=10)
 
         self.controleur = ControleurImage(self.slider, self.slider2, self.slider3)
 
     def _on_hsv_change(self, *_):
-        if self.latest_frame is None:
+        # Slider events only mark the thresholds dirty; the display loop
+        # reprocesses once per tick with the latest values.
+        self._hsv_pending = True
+
+    def _request_autotune(self):
+        if not self._recent_frames:
+            print("No webcam frame captured")
             return
+        self._autotune_pending = True
 
-        h_min, h_max = self.slider.getValues()
-        s_min, s_max = self.slider2.getValues()
-        v_min, v_max = self.slider3.getValues()
-        thresholds = HsvThresholds((h_min, h_max), (s_min, s_max), (v_min, v_max))
+    def _autotune_job(self, frames):
+        """Worker side of the Auto button."""
+        with self.timer.stage("autotune"):
+            return "autotune", auto_tune(frames)
 
-        image_pil = Image.fromarray(cv2.cvtColor(self.latest_frame, cv2.COLOR_BGR2RGB))
-        _, annotated = self.controleur.traiter_image(image_pil, thresholds=thresholds)
-        GestionAffichage.resize_image(annotated, self.label_4, self.Frame4)
+    def _apply_autotune(self, thresholds):
+        if thresholds is None:
+            print("No stable frame found, thresholds unchanged.")
+            return
+        for slider, values in zip((self.slider, self.slider2, self.slider3), (thresholds.h, thresholds.s, thresholds.v)):
+            slider.setValues(values)
+        print(f"Thresholds found: H {thresholds.h}, S {thresholds.s}, V {thresholds.v}")
+        self._hsv_pending = True
 
     def _validate_cadre(self):
         if self.latest_frame is None:
             print("No webcam frame captured")
             return
 
-        h_min, h_max = self.slider.getValues()
-        s_min, s_max = self.slider2.getValues()
-        v_min, v_max = self.slider3.getValues()
-        thresholds = HsvThresholds((h_min, h_max), (s_min, s_max), (v_min, v_max))
-
-        image_bgr = self.latest_frame.copy()
-        mask = compute_hsv_mask(image_bgr, thresholds.h, thresholds.s, thresholds.v)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, np.ones((5, 5), np.uint8))
-
-        best = biggest_inner_quad(mask)
+        # The worker may still be using the controller's buffers.
+        thresholds = self.controleur.thresholds()
+        self.hsv_init = (thresholds.h, thresholds.s, thresholds.v)
+        best = HsvPreprocessor().process(self.latest_frame, thresholds, annotate=False).quad
 
         if best is not None:
             self.ref_quad = np.float32(best.reshape(4, 2))
@@ -152,32 +251,79 @@ class MainWindow:
             self.ref_quad = None
             print("No frame detected.")
 
+        # The other cameras see the display from elsewhere: each gets its own
+        # reference frame, found with the same thresholds.
+        self.ref_quads = [self.ref_quad]
+        if self.pool is not None:
+            for source, cap in zip(self.pool.sources[1:], self.pool.cameras[1:]):
+                packet = cap.newest()
+                quad = HsvPreprocessor().process(packet.image, thresholds, annotate=False).quad if packet else None
+                self.ref_quads.append(np.float32(quad.reshape(4, 2)) if quad is not None else None)
+                if quad is None:
+                    print(f"No frame detected on camera {source}.")
+
+    def _border_job(self, seq, frame, thresholds):
+        """Worker side of screen 1."""
+        with self.timer.stage("hsv"):
+            detection = self.controleur.traiter_bgr(frame, thresholds, frame_key=seq)
+        return "border", seq, frame, thresholds, detection
+
+    def _read_camera(self):
+        """
+        Newest camera frame for the display loops, or None. A camera that did
+        not open is skipped (reported once by ``_open_camera``), and a
+        non-threaded one grabs on this thread, so only once a frame is due.
+        """
+        cap = self.cap
+        if cap is None or not cap.is_opened:
+            return None
+        if not cap.threaded and time.monotonic() < self._next_submit:
+            return None
+        with self.timer.stage("capture"):
+            packet = cap.read_latest()
+        if packet is None and not cap.threaded:
+            if not self._read_error_reported:
+                print("Error reading webcam.")
+            self._read_error_reported = True
+        elif packet is not None:
+            self._read_error_reported = False
+        return packet
+
     def _init_display_loop(self):
         def update_frame():
             if self.mode_columns:
                 return
 
-            ok, frame = self.cap.read()
-            if not ok:
-                print("Error reading webcam.")
-                self.root.after(FRAME_DELAY_MS, update_frame)
-                return
-
-            self.latest_frame = frame.copy()
-            image_pil = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-
-            h_min, h_max = self.slider.getValues()
-            s_min, s_max = self.slider2.getValues()
-            v_min, v_max = self.slider3.getValues()
-            thresholds = HsvThresholds((h_min, h_max), (s_min, s_max), (v_min, v_max))
-
-            mask_pil, annotated_pil = self.controleur.traiter_image(image_pil, thresholds=thresholds)
-
-            GestionAffichage.resize_image(image_pil, self.label_1, self.Frame1)
-            GestionAffichage.resize_image(mask_pil, self.label_3, self.Frame3)
-            GestionAffichage.resize_image(annotated_pil, self.label_4, self.Frame4)
-
-            self.root.after(FRAME_DELAY_MS, update_frame)
+            done = self.worker.poll()
+            if done is not None and done[0] == "border":
+                _, seq, frame, thresholds, detection = done
+                with self.timer.stage("render"):
+                    self.view_frame.show(frame, token=seq)
+                    self.view_mask.show(detection.mask, token=(seq, thresholds))
+                    self.view_annotated.show(detection.annotated, token=(seq, thresholds))
+            elif done is not None and done[0] == "autotune":
+                self._apply_autotune(done[1])
+
+            if self._autotune_pending and self.worker.submit(self._autotune_job, list(self._recent_frames)):
+                self._autotune_pending = False
+
+            packet = self._read_camera()
+
+            if self._hsv_pending and self.latest_frame is not None:
+                # Thresholds changed: redo the frame on screen, whose HSV the worker
+                # still holds, and keep it frozen while the sliders move.
+                if self.worker.submit(self._border_job, self._last_seq, self.latest_frame, self.controleur.thresholds()):
+                    self._hsv_pending = False
+                    self._next_submit = time.monotonic() + FRAME_DELAY_MS / 1000.0
+            elif packet is not None and packet.seq != self._last_seq and time.monotonic() >= self._next_submit:
+                if self.worker.submit(self._border_job, packet.seq, packet.image, self.controleur.thresholds()):
+                    self._last_seq = packet.seq
+                    self.latest_frame = packet.image
+                    self._recent_frames.append(packet.image)
+                    self._hsv_pending = False
+                    self._next_submit = time.monotonic() + FRAME_DELAY_MS / 1000.0
+
+            self.root.after(POLL_DELAY_MS, update_frame)
 
         update_frame()
 
@@ -185,6 +331,9 @@ class MainWindow:
     def _build_second_screen(self):
         self.mode_columns = True
         self._cancel_second_loop()
+        # A job from the previous screen may still be using the tracker or the
+        # reference about to be replaced.
+        self.worker.drain()
 
         for w in self.root.winfo_children():
             w.destroy()
@@ -206,17 +355,18 @@ class MainWindow:
         for f in (self.col1, self.col2, self.col3, self.col4):
             f.grid_propagate(False)
 
+        ThirdPartySlider = third_party_slider()
         if ThirdPartySlider is not None:
             self.slider_expo2 = ThirdPartySlider(
                 self.col1, min_val=EXPO_MIN, max_val=EXPO_MAX,
-                init_lis=[EXPO_DEFAULT], show_value=True, height=40
+                init_lis=[self.exposure], show_value=True, height=40
             )
             self.slider_expo2.place(x=40, y=60, width=self.PANEL_W_2 - 80)
             ttk.Label(self.col1, text="Exposure").place(x=self.PANEL_W_2 // 2, y=20, anchor="center")
             self.slider_expo2.setValueChangeCallback(self._on_expo_change)
         else:
             ttk.Label(self.col1, text="Exposure").place(x=self.PANEL_W_2 // 2, y=20, anchor="center")
-            exo2 = SingleSlider(self.col1, "", EXPO_MIN, EXPO_MAX, EXPO_DEFAULT, on_change=self._on_expo_change)
+            exo2 = SingleSlider(self.col1, "", EXPO_MIN, EXPO_MAX, self.exposure, on_change=self._on_expo_change)
             exo2.place(x=40, y=60, width=self.PANEL_W_2 - 80)
             self.slider_expo2 = exo2
 
@@ -225,9 +375,11 @@ class MainWindow:
 
         self.label_matches = tk.Label(self.col2)
         self.label_matches.place(x=0, y=0)
+        self.view_matches = PanelRenderer(self.label_matches, size=(self.PANEL_W_2, self.PANEL_H_2))
 
         self.label_estimation = tk.Label(self.col3)
         self.label_estimation.place(x=0, y=0)
+        self.view_estimation = PanelRenderer(self.label_estimation, size=(self.PANEL_W_2, self.PANEL_H_2))
 
         self.label_infos = tk.Label(
             self.col4, text="", justify="left", anchor="nw",
@@ -235,23 +387,34 @@ class MainWindow:
         )
         self.label_infos.place(x=8, y=8, width=self.PANEL_W_2 - 16, height=self.PANEL_H_2 - 16)
 
-        self.marker_bgr = cv2.imread(str(MARKER_IMAGE)) if MARKER_IMAGE.exists() else None
-        if self.marker_bgr is None:
-            self.label_infos.config(text="Marker not found in ./assets/MainBefore.jpg")
-            if hasattr(self, "marker_gray"):
-                del self.marker_gray
-            if hasattr(self, "analyseur"):
-                del self.analyseur
+        profile, self._profile_marker = self._profile_marker, None
+        if profile is not None:
+            features = None
+            if profile.marker_detector == self.tracker.backend.ident:
+                features = keypoints_from_array(profile.marker_keypoints), profile.marker_descriptors
+            self.tracker.load_marker(profile.marker_gray, features)
         else:
-            self.marker_gray = cv2.cvtColor(self.marker_bgr, cv2.COLOR_BGR2GRAY)
-            self.tracker.load_marker(self.marker_bgr)
-            from ..services.marker import AnalyseurSIFT
-            self.analyseur = AnalyseurSIFT(self.marker_gray)
+            self.marker_bgr = cv2.imread(str(MARKER_IMAGE)) if MARKER_IMAGE.exists() else None
+            if self.marker_bgr is None:
+                self.label_infos.config(text="Marker not found in ./assets/MainBefore.jpg")
+            else:
+                self.tracker.load_marker(self.marker_bgr)
+        self.pipeline.ref_quad = self.ref_quad
+        self.set_pipeline = None
+        if self.pool is not None and len(self.pool) > 1:
+            others = [AlignmentPipeline(MarkerTracker(history_len=HISTORY_LEN, timer=self.timer))
+                      for _ in self.pool.cameras[1:]]
+            self.set_pipeline = FrameSetPipeline([self.pipeline] + others)
+            if self.tracker.marker_gray is not None:
+                self.set_pipeline.load_marker(self.tracker.marker_gray, self.tracker.marker_features)
+            self.set_pipeline.set_references(self.ref_quads)
+        self._save_profile()
 
         self._loop_columns()
 
     def _back_to_first_screen(self):
         self._cancel_second_loop()
+        self.worker.drain()
         self.mode_columns = False
         self.ref_quad = None
         if hasattr(self, "_marker_history"):
@@ -274,57 +437,92 @@ class MainWindow:
         if not (hasattr(self, "label_infos") and self.label_infos.winfo_exists()):
             return
 
-        ok, frame = self.cap.read()
-        if not ok:
-            self._loop_job = self.root.after(MATCH_DELAY_MS, self._loop_columns)
+        done = self.worker.poll()
+        if done is not None and done[0] == "alignment":
+            _, seq, aligned = done
+            if not self._show_alignment(seq, aligned):
+                return
+        elif done is not None and done[0] == "alignment_set":
+            _, seq, results = done
+            if not self._show_alignment(seq, results[0], results[1:]):
+                return
+
+        if self.set_pipeline is not None:
+            self._submit_frame_set()
+            self._loop_job = self.root.after(POLL_DELAY_MS, self._loop_columns)
             return
 
-        original_bgr = frame.copy()
+        packet = self._read_camera()
+        if packet is not None and packet.seq != self._last_seq and time.monotonic() >= self._next_submit:
+            if self.worker.submit(self._alignment_job, packet.seq, packet.image):
+                self._last_seq = packet.seq
+                self._next_submit = time.monotonic() + MATCH_DELAY_MS / 1000.0
 
-        result = self.tracker.match(original_bgr)
+        self._loop_job = self.root.after(POLL_DELAY_MS, self._loop_columns)
 
-        matched_img = original_bgr.copy()
-        if hasattr(self, "analyseur") and hasattr(self, "marker_gray"):
-            good, kp1, kp2, des1 = self.analyseur.detecter_correspondances(original_bgr)
-            if kp1 is not None and kp2 is not None:
-                matched_img = cv2.drawMatches(
-                    self.marker_gray, kp1,
-                    original_bgr, kp2,
-                    good, None,
-                    flags=cv2.DrawMatchesFlags_NOT_DRAW_SINGLE_POINTS
-                )
-        else:
-            if result.matches_vis is not None:
-                matched_img = result.matches_vis
+    def _submit_frame_set(self):
+        """Several cameras: align the newest synced set once a match is due."""
+        if time.monotonic() < self._next_submit:
+            return
+        frame_set = self.pool.read_synced()
+        if frame_set is None:
+            return
+        seq = frame_set.frames[0].seq
+        if self.worker.submit(self._alignment_set_job, seq, frame_set):
+            self._last_seq = seq
+            self._next_submit = time.monotonic() + MATCH_DELAY_MS / 1000.0
+
+    def _alignment_job(self, seq, frame):
+        """Worker side of screen 2."""
+        return "alignment", seq, self.pipeline.process(frame, visualize=True)
 
-        found_marker = original_bgr.copy()
-        if result.dst_quad is not None:
-            cv2.polylines(found_marker, [np.int32(result.dst_quad)], True, (255, 0, 0), 3)
-        if self.ref_quad is not None:
-            cv2.polylines(found_marker, [np.int32(self.ref_quad)], True, (0, 255, 0), 3)
+    def _alignment_set_job(self, seq, frame_set):
+        """Worker side of screen 2 with several cameras; the panels show the first one."""
+        return "alignment_set", seq, self.set_pipeline.process(frame_set, visualize=True)
 
+    def _show_alignment(self, seq, aligned, others=()) -> bool:
         infos_text = ""
-        if self.ref_quad is not None and result.dst_quad is not None and len(result.dst_quad) == 4:
-            recouvrement, angle_x, angle_y = coverage_and_angles(self.ref_quad, result.dst_quad.reshape(4, 2))
-            if recouvrement is not None:
-                infos_text += f"Overlap: {recouvrement:.2f}%\n"
-            if angle_x is not None and angle_y is not None:
-                infos_text += f"Tilt X: {angle_x:.2f}°\nTilt Y: {angle_y:.2f}°\n"
+        if self.ref_quad is not None and aligned.homography.dst_quad is not None:
+            if aligned.overlap is not None:
+                infos_text += f"Overlap: {aligned.overlap:.2f}%\n"
+            if aligned.angle_x is not None and aligned.angle_y is not None:
+                infos_text += f"Tilt X: {aligned.angle_x:.2f}°\nTilt Y: {aligned.angle_y:.2f}°\n"
         else:
             infos_text += "Frame or marker not detected.\n"
+        if aligned.homography.H is not None:
+            self._last_H = aligned.homography.H
+            mode = "tracking" if aligned.homography.tracked else "detection"
+            infos_text += f"Mode: {mode} ({aligned.homography.num_inliers} inliers)\n"
+        if others:
+            infos_text += self._format_other_cameras(others)
+        if self.timer.enabled:
+            infos_text += "\n" + self.timer.format() + "\n"
 
         try:
             self.label_infos.config(text=infos_text)
             self.label_infos.config(fg="red" if "Error" in infos_text else "black")
         except tk.TclError:
-            return
-
-        pil_matches = Image.fromarray(cv2.cvtColor(matched_img, cv2.COLOR_BGR2RGB))
-        pil_estimation = Image.fromarray(cv2.cvtColor(found_marker, cv2.COLOR_BGR2RGB))
-        GestionAffichage.resize_image_fixed(pil_matches, self.label_matches, self.PANEL_W_2, self.PANEL_H_2)
-        GestionAffichage.resize_image_fixed(pil_estimation, self.label_estimation, self.PANEL_W_2, self.PANEL_H_2)
-
-        self._loop_job = self.root.after(MATCH_DELAY_MS, self._loop_columns)
+            return False
+
+        with self.timer.stage("render"):
+            self.view_matches.show(aligned.matches_vis, token=seq)
+            self.view_estimation.show(aligned.estimation_vis, token=seq)
+        return True
+
+    def _format_other_cameras(self, others) -> str:
+        text = ""
+        for source, other in zip(self.pool.sources[1:], others):
+            if other.overlap is None:
+                text += f"\nCamera {source}: frame or marker not detected"
+            else:
+                text += f"\nCamera {source}: overlap {other.overlap:.2f}%"
+                if other.angle_x is not None and other.angle_y is not None:
+                    text += f", tilt {other.angle_x:.2f}° / {other.angle_y:.2f}°"
+        stats = self.pool.stats()
+        text += "\n\n" + "\n".join(
+            f"Camera {source}: {s['fps']:.1f} fps, latency {s['latency_ms']:.1f} ms" for source, s in stats.items()
+        )
+        return text + f"\nSets: {self.pool.sets_delivered} synced, {self.pool.sets_skewed} skewed\n"
 
     def _on_expo_change(self, *_):
         try:
@@ -341,13 +539,72 @@ class MainWindow:
                     return
             else:
                 return
-            self.cap.set_exposure(val)
+            self.exposure = val
+            caps = self.pool.cameras if self.pool is not None else [self.cap]
+            for cap in caps:
+                if cap is not None:
+                    cap.set_exposure(val)
             print(f"Exposure set to {val}")
         except Exception as e:
             print(f"Error setting exposure: {e}")
 
+    def _dump_timings(self) -> None:
+        if not self.timer.enabled:
+            return
+        self.timer.dump(TIMING_DUMP)
+        print(f"Timings written to {TIMING_DUMP}")
+
+    # ---------- PROFILE ----------
+    def _load_profile(self) -> CalibrationProfile | None:
+        try:
+            return CalibrationProfile.load(self.profile_path)
+        except Exception as e:
+            print(f"Unable to load calibration profile {self.profile_path}: {e}")
+            return None
+
+    def _save_profile(self) -> None:
+        """Store the current calibration; only meaningful once a reference frame exists."""
+        if self.ref_quad is None:
+            return
+        # Until the camera is open, keep the camera fields we started from.
+        camera_index, camera_device, camera_backend = self._camera_fields
+        if self.cap is not None and self.cap.is_opened:
+            source = self.cap.source
+            camera_index = source if isinstance(source, int) else self.camera
+            camera_device = source[len("video="):] if isinstance(source, str) else None
+            camera_backend = int(self.cap.api)
+        profile = CalibrationProfile(
+            thresholds=HsvThresholds(*self.hsv_init),
+            ref_quad=self.ref_quad,
+            exposure=self.exposure,
+            camera_index=camera_index,
+            camera_device=camera_device,
+            camera_backend=camera_backend,
+            marker_gray=self.tracker.marker_gray,
+            marker_detector=self.tracker.backend.ident,
+            homography=self._last_H,
+        )
+        kp, des = self.tracker.marker_features
+        if kp is not None:
+            profile.marker_keypoints = keypoints_to_array(kp)
+            profile.marker_descriptors = des
+        try:
+            profile.save(self.profile_path)
+        except Exception as e:
+            print(f"Unable to save calibration profile: {e}")
+
     def _on_close(self):
-        self.cap.release()
+        if self.mode_columns:
+            self._save_profile()
+        self._dump_timings()
+        self.worker.shutdown()
+        with self._camera_lock:
+            self._closing = True
+            cap, pool = self.cap, self.pool
+        if pool is not None:
+            pool.release()
+        elif cap is not None:
+            cap.release()
         self.root.destroy()
 
     def run(self) -> None:
@@ -1,25 +1,29 @@
 
 from __future__ import annotations
 import tkinter as tk
+from functools import lru_cache
 from tkinter import ttk
 
-try:
-    from tkSliderWidget.tkSliderWidget import Slider as ThirdPartySlider 
-except Exception:
-    ThirdPartySlider = None
+
+@lru_cache(maxsize=None)
+def third_party_slider():
+    """The tkSliderWidget ``Slider`` class, imported on first use; None when unavailable."""
+    try:
+        from tkSliderWidget.tkSliderWidget import Slider
+    except Exception:
+        return None
+    return Slider
+
 
 class RangeSlider(ttk.Frame):
     def __init__(self, parent, text: str, min_val: int, max_val: int, init_lis=(0, 255), on_change=None):
         super().__init__(parent)
         ttk.Label(self, text=text).pack(pady=4)
         self.on_change = on_change
-        if ThirdPartySlider is not None:
-            self._impl = ThirdPartySlider(self, height=40, min_val=min_val, max_val=max_val,
-                                          init_lis=list(init_lis), show_value=True)
-            self._impl.pack(fill="x", padx=24)
-            if on_change:
-                self._impl.setValueChangeCallback(on_change)
-            self.getValues = self._impl.getValues 
+        self._range = (min_val, max_val)
+        self._impl = None
+        if third_party_slider() is not None:
+            self._build_impl(init_lis)
         else:
             inner = ttk.Frame(self); inner.pack(fill="x", padx=16)
             self._min = tk.DoubleVar(value=init_lis[0])
@@ -33,9 +37,27 @@ class RangeSlider(ttk.Frame):
             self.smax = ttk.Scale(row2, from_=min_val, to=max_val, variable=self._max, command=lambda *_: on_change and on_change())
             self.smax.pack(side="left", fill="x", expand=True, padx=6)
 
+    def _build_impl(self, values) -> None:
+        self._impl = third_party_slider()(self, height=40, min_val=self._range[0], max_val=self._range[1],
+                                          init_lis=list(values), show_value=True)
+        self._impl.pack(fill="x", padx=24)
+        if self.on_change:
+            self._impl.setValueChangeCallback(self.on_change)
+
     def getValues(self):  
+        if self._impl is not None:
+            return self._impl.getValues()
         return (int(self._min.get()), int(self._max.get()))
 
+    def setValues(self, values) -> None:
+        """Move both handles without firing ``on_change``; the third-party slider has no setter and is rebuilt."""
+        if self._impl is not None:
+            self._impl.destroy()
+            self._build_impl(values)
+        else:
+            self._min.set(values[0])
+            self._max.set(values[1])
+
 class SingleSlider(ttk.Frame):
     def __init__(self, parent, text: str, min_val: float, max_val: float, init_val: float, on_change=None):
         super().__init__(parent)
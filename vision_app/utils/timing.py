@@ -0,0 +1,86 @@
+
+from __future__ import annotations
+import json
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Deque, Dict
+import numpy as np
+
+_NULL = nullcontext()
+
+
+class _Stage:
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer: "StageTimer", name: str) -> None:
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self) -> "_Stage":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.timer.record(self.name, time.perf_counter() - self.start)
+
+
+class StageTimer:
+    """
+    Rolling per-stage latency statistics.
+
+    ``with timer.stage("sift"): ...`` records the block duration. While
+    disabled, ``stage`` returns a shared no-op context, so hooks can stay in
+    the hot paths. Samples are kept over the last ``window`` calls per stage.
+    """
+
+    def __init__(self, enabled: bool = False, window: int = 300) -> None:
+        self.enabled = enabled
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return _NULL
+        return _Stage(self, name)
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """``{stage: {n, p50_ms, p95_ms, p99_ms}}`` in first-seen order."""
+        with self._lock:
+            snapshot = {name: np.fromiter(samples, np.float64) for name, samples in self._samples.items()}
+        out = {}
+        for name, values in snapshot.items():
+            if not len(values):
+                continue
+            p50, p95, p99 = np.percentile(values, [50, 95, 99]) * 1000.0
+            out[name] = {"n": int(len(values)), "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99)}
+        return out
+
+    def format(self) -> str:
+        lines = [f"{'stage':<12}{'p50':>8}{'p95':>8}{'p99':>8}  ms"]
+        for name, stats in self.summary().items():
+            lines.append(f"{name:<12}{stats['p50_ms']:8.1f}{stats['p95_ms']:8.1f}{stats['p99_ms']:8.1f}")
+        return "\n".join(lines)
+
+    def dump(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        report = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "window": self.window, "stages": self.summary()}
+        path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+NULL_TIMER = StageTimer(enabled=False)
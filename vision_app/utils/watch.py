@@ -0,0 +1,44 @@
+
+from __future__ import annotations
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+class FileWatcher:
+    """
+    Change detection for a file rewritten by another program.
+
+    ``poll`` compares the file's (mtime, size) with the previous poll and only
+    reports a change once that signature has stayed the same for two polls in
+    a row, so a file still being written is not picked up halfway. A version
+    keeps being reported until the caller confirms it was read with ``ack``,
+    so a failed load is retried on the next poll.
+    """
+
+    def __init__(self, path) -> None:
+        self.path = Path(path)
+        self._seen: Optional[Tuple[int, int]] = None
+        self._reported: Optional[Tuple[int, int]] = None
+        self._loaded: Optional[Tuple[int, int]] = None
+
+    def _signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def poll(self) -> bool:
+        """True when the file has a settled version that was not acknowledged yet."""
+        sig = self._signature()
+        settled = sig is not None and sig == self._seen
+        self._seen = sig
+        if not settled or sig == self._loaded:
+            return False
+        self._reported = sig
+        return True
+
+    def ack(self) -> None:
+        """The version reported by the last ``poll`` was read successfully."""
+        self._loaded = self._reported